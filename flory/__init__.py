@@ -40,4 +40,4 @@ from .interaction import (
     InteractionBase,
 )
 from .mcmp import CoexistingPhasesFinder
-from .shortcut import find_coexisting_phases
+from .shortcut import find_coexisting_phases, find_coexisting_phases_batch
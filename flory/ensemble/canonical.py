@@ -54,12 +54,19 @@ class CanonicalEnsembleCompiled(EnsembleBaseCompiled):
     def normalize(
         self, phis_comp: np.ndarray, Qs: np.ndarray, masks: np.ndarray
     ) -> np.ndarray:
-        incomp = -1.0 * np.ones_like(phis_comp[0])
+        num_part = masks.shape[0]
+        incomp = np.empty(num_part)
+        incomp.fill(-1.0)
+        # the volume fractions are scaled and summed up in a single pass, without
+        # creating temporaries
         for itr_comp in range(self._num_comp):
             factor = self._phi_means[itr_comp] / Qs[itr_comp]
-            phis_comp[itr_comp] = factor * phis_comp[itr_comp] * masks
-            incomp += phis_comp[itr_comp]
-        incomp *= masks
+            for itr_part in range(num_part):
+                phi = factor * phis_comp[itr_comp, itr_part] * masks[itr_part]
+                phis_comp[itr_comp, itr_part] = phi
+                incomp[itr_part] += phi
+        for itr_part in range(num_part):
+            incomp[itr_part] *= masks[itr_part]
         return incomp
 
 
@@ -96,10 +103,13 @@ class CanonicalEnsemble(EnsembleBase):
 
     @phi_means.setter
     def phi_means(self, phi_means_new: np.ndarray):
-        phi_means_new = np.array(phi_means_new)  # copy data
-        self._phi_means = np.broadcast_to(phi_means_new, (self.num_comp,))
+        # copy data into a C-contiguous array, as required by the compiled instance
+        self._phi_means = np.array(
+            np.broadcast_to(phi_means_new, (self.num_comp,)), dtype=np.float64
+        )
 
-        if not np.isclose(self._phi_means.sum(), 1.0):
+        # same tolerance as the defaults of np.isclose, but computed on Python floats
+        if abs(float(self._phi_means.sum()) - 1.0) > 1e-8 + 1e-5:
             self._logger.warning(
                 "The sum of phi_means is not 1. In incompressible system the iteration may never converge."
             )
@@ -54,13 +54,19 @@ class GrandCanonicalEnsembleCompiled(EnsembleBaseCompiled):
     def normalize(
         self, phis_comp: np.ndarray, Qs: np.ndarray, masks: np.ndarray
     ) -> np.ndarray:
-        incomp = -1.0 * np.ones_like(phis_comp[0])
+        num_part = masks.shape[0]
+        incomp = np.empty(num_part)
+        incomp.fill(-1.0)
+        # the volume fractions are scaled and summed up in a single pass, without
+        # creating temporaries
         for itr_comp in range(self._num_comp):
-            phis_comp[itr_comp] = (
-                self._scaled_activity[itr_comp] * phis_comp[itr_comp] * masks
-            )
-            incomp += phis_comp[itr_comp]
-        incomp *= masks
+            factor = self._scaled_activity[itr_comp]
+            for itr_part in range(num_part):
+                phi = factor * phis_comp[itr_comp, itr_part] * masks[itr_part]
+                phis_comp[itr_comp, itr_part] = phi
+                incomp[itr_part] += phi
+        for itr_part in range(num_part):
+            incomp[itr_part] *= masks[itr_part]
         return incomp
 
 
@@ -85,7 +91,9 @@ class GrandCanonicalEnsemble(EnsembleBase):
         scaled_activity = np.atleast_1d(scaled_activity)
 
         shape = (num_comp,)
-        self._scaled_activity = np.array(np.broadcast_to(scaled_activity, shape))
+        self._scaled_activity = np.array(
+            np.broadcast_to(scaled_activity, shape), dtype=np.float64
+        )
 
     @property
     def scaled_activity(self) -> np.ndarray:
@@ -96,7 +104,9 @@ class GrandCanonicalEnsemble(EnsembleBase):
     def scaled_activity(self, scaled_activity_new: np.ndarray):
         scaled_activity_new = np.atleast_1d(scaled_activity_new)
         shape = (self.num_comp,)
-        self._scaled_activity = np.array(np.broadcast_to(scaled_activity_new, shape))
+        self._scaled_activity = np.array(
+            np.broadcast_to(scaled_activity_new, shape), dtype=np.float64
+        )
 
     @classmethod
     def from_chemical_potential(
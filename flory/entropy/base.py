@@ -3,6 +3,8 @@
 .. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
 """
 
+from __future__ import annotations
+
 import numpy as np
 
 from ..common import filter_kwargs
@@ -166,7 +168,9 @@ class EntropyBase:
         """
         raise NotImplementedError
 
-    def _hessian_impl(self, phis: np.ndarray) -> np.ndarray:
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         r"""Implementation of calculating Hessian :math:`\partial^2 f_\mathrm{entropy}/\partial \phi_i^2` (Interface).
 
         This interface is meant to be overridden in derived classes. Multiple compositions
@@ -177,6 +181,9 @@ class EntropyBase:
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
                 phases are included, the index of the components must be the last
                 dimension.
+            out:
+                Optional array with the shape of the full Hessian. If given, the result
+                must be written to it and it is returned.
 
         Returns:
             : The full Hessian.
@@ -19,6 +19,7 @@ from .base import EntropyBase, EntropyBaseCompiled
         ("_num_comp", int32),  # a scalar
         ("_num_feat", int32),  # a scalar
         ("_sizes", float64[::1]),  # a C-continuous array
+        ("_inv_sizes", float64[::1]),  # a C-continuous array
     ]
 )
 class IdealGasEntropyCompiled(EntropyBaseCompiled):
@@ -49,6 +50,8 @@ class IdealGasEntropyCompiled(EntropyBaseCompiled):
         self._num_comp = sizes.shape[0]
         self._num_feat = sizes.shape[0]
         self._sizes = sizes
+        # multiplications are cheaper than divisions in the volume derivative
+        self._inv_sizes = 1.0 / sizes
 
     @property
     def num_comp(self) -> int:
@@ -63,10 +66,16 @@ class IdealGasEntropyCompiled(EntropyBaseCompiled):
     ) -> np.ndarray:
         Qs = np.zeros((self._num_comp,))
         total_Js = Js.sum()
+        # the Boltzmann factors are accumulated while they are written, without
+        # creating temporaries
         for itr_comp in range(self._num_comp):
-            phis_comp[itr_comp] = np.exp(-omegas[itr_comp] * self._sizes[itr_comp])
-            Qs[itr_comp] = (phis_comp[itr_comp] * Js).sum()
-            Qs[itr_comp] /= total_Js
+            size = self._sizes[itr_comp]
+            Q = 0.0
+            for itr_part in range(Js.shape[0]):
+                phi = np.exp(-omegas[itr_comp, itr_part] * size)
+                phis_comp[itr_comp, itr_part] = phi
+                Q += phi * Js[itr_part]
+            Qs[itr_comp] = Q / total_Js
         return Qs
 
     def comp_to_feat(self, phis_feat: np.ndarray, phis_comp: np.ndarray) -> None:
@@ -77,7 +86,7 @@ class IdealGasEntropyCompiled(EntropyBaseCompiled):
     def volume_derivative(self, phis_comp: np.ndarray) -> np.ndarray:
         ans = np.zeros_like(phis_comp[0])
         for itr_comp in range(self.num_comp):
-            ans -= phis_comp[itr_comp] / self._sizes[itr_comp]
+            ans -= phis_comp[itr_comp] * self._inv_sizes[itr_comp]
         return ans
 
 class IdealGasEntropyBase(EntropyBase):
@@ -118,7 +127,7 @@ class IdealGasEntropyBase(EntropyBase):
         else:
             sizes = np.atleast_1d(sizes)
             shape = (num_comp,)
-            self._sizes = np.array(np.broadcast_to(sizes, shape))
+            self._sizes = np.array(np.broadcast_to(sizes, shape), dtype=np.float64)
 
     def _energy_impl(self, phis: np.ndarray) -> np.ndarray:
         r"""Implementation of calculating entropic energy :math:`f_\mathrm{entropy}`.
@@ -156,7 +165,9 @@ class IdealGasEntropyBase(EntropyBase):
         """
         return np.log(phis) / self._sizes + 1.0 / self._sizes
 
-    def _hessian_impl(self, phis: np.ndarray) -> np.ndarray:
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         r"""Implementation of calculating Hessian :math:`\partial^2 f_\mathrm{entropy}/\partial \phi_i^2`.
 
         This method overwrites the interface
@@ -168,11 +179,20 @@ class IdealGasEntropyBase(EntropyBase):
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
                 phases are included, the index of the components must be the last
                 dimension.
+            out:
+                Optional array with the shape of the full Hessian, to which the result is
+                written.
 
         Returns:
             : The full Hessian.
         """
-        return np.eye(self.num_comp) / (phis * self._sizes)[..., None]
+        if out is None:
+            out = np.zeros(phis.shape + (self.num_comp,))
+        else:
+            out.fill(0.0)
+        # writable view of the diagonals, avoiding a division of the full matrices
+        np.einsum("...ii->...i", out)[...] = 1.0 / (phis * self._sizes)
+        return out
 
 class IdealGasEntropy(IdealGasEntropyBase):
     r"""Class for entropic energy of mixture of ideal gas.
@@ -215,7 +235,7 @@ class IdealGasEntropy(IdealGasEntropyBase):
     def sizes(self, sizes_new: np.ndarray):
         sizes_new = np.atleast_1d(sizes_new)
         shape = (self.num_comp,)
-        self._sizes = np.array(np.broadcast_to(sizes_new, shape))
+        self._sizes = np.array(np.broadcast_to(sizes_new, shape), dtype=np.float64)
 
     def _compiled_impl(self) -> IdealGasEntropyCompiled:
         """Implementation of creating a compiled entropy instance.
@@ -228,4 +248,5 @@ class IdealGasEntropy(IdealGasEntropyBase):
             : Instance of :class:`IdealGasEntropyCompiled`.
         """
 
-        return IdealGasEntropyCompiled(self._sizes.astype(np.float64))
\ No newline at end of file
+        # copy so that in-place changes of `sizes` cannot desynchronize `_inv_sizes`
+        return IdealGasEntropyCompiled(np.array(self._sizes))
\ No newline at end of file
@@ -22,6 +22,7 @@ from .ideal_gas import IdealGasEntropyBase
         ("_num_feat", int32),  # a scalar
         ("_num_comp_per_feat", int32[::1]),  # a C-continuous array
         ("_sizes", float64[::1]),  # a C-continuous array
+        ("_inv_sizes", float64[::1]),  # a C-continuous array
     ]
 )
 class IdealGasPolydispersedEntropyCompiled(EntropyBaseCompiled):
@@ -56,6 +57,8 @@ class IdealGasPolydispersedEntropyCompiled(EntropyBaseCompiled):
         self._num_comp = sizes.shape[0]
         self._num_feat = num_comp_per_feat.shape[0]
         self._sizes = sizes
+        # multiplications are cheaper than divisions in the volume derivative
+        self._inv_sizes = 1.0 / sizes
         self._num_comp_per_feat = num_comp_per_feat
 
     @property
@@ -72,12 +75,18 @@ class IdealGasPolydispersedEntropyCompiled(EntropyBaseCompiled):
         Qs = np.zeros((self._num_comp,))
         total_Js = Js.sum()
 
+        # the Boltzmann factors are accumulated while they are written, without
+        # creating temporaries
         itr_comp = 0
         for itr_feat in range(self._num_feat):
             for _ in range(self._num_comp_per_feat[itr_feat]):
-                phis_comp[itr_comp] = np.exp(-omegas[itr_feat] * self._sizes[itr_comp])
-                Qs[itr_comp] = (phis_comp[itr_comp] * Js).sum()
-                Qs[itr_comp] /= total_Js
+                size = self._sizes[itr_comp]
+                Q = 0.0
+                for itr_part in range(Js.shape[0]):
+                    phi = np.exp(-omegas[itr_feat, itr_part] * size)
+                    phis_comp[itr_comp, itr_part] = phi
+                    Q += phi * Js[itr_part]
+                Qs[itr_comp] = Q / total_Js
                 itr_comp += 1
         return Qs
 
@@ -93,7 +102,7 @@ class IdealGasPolydispersedEntropyCompiled(EntropyBaseCompiled):
     def volume_derivative(self, phis_comp: np.ndarray) -> np.ndarray:
         ans = np.zeros_like(phis_comp[0])
         for itr_comp in range(self.num_comp):
-            ans -= phis_comp[itr_comp] / self._sizes[itr_comp]
+            ans -= phis_comp[itr_comp] * self._inv_sizes[itr_comp]
         return ans
 
 
@@ -150,7 +159,7 @@ class IdealGasPolydispersedEntropy(IdealGasEntropyBase):
     def sizes(self, sizes_new: np.ndarray):
         sizes_new = np.atleast_1d(sizes_new)
         shape = (self.num_comp,)
-        self._sizes = np.array(np.broadcast_to(sizes_new, shape))
+        self._sizes = np.array(np.broadcast_to(sizes_new, shape), dtype=np.float64)
 
     def _compiled_impl(self) -> IdealGasPolydispersedEntropyCompiled:
         """Implementation of creating a compiled entropy instance.
@@ -162,6 +171,7 @@ class IdealGasPolydispersedEntropy(IdealGasEntropyBase):
         Returns:
             : Instance of :class:`IdealGasPolydispersedEntropyCompiled`.
         """
+        # copy so that in-place changes of `sizes` cannot desynchronize `_inv_sizes`
         return IdealGasPolydispersedEntropyCompiled(
-            self._sizes.astype(np.float64), self._num_comp_per_feat.astype(np.int32)
+            np.array(self._sizes), self._num_comp_per_feat.astype(np.int32)
         )
@@ -4,4 +4,5 @@
 .. codeauthor:: David Zwicker <david.zwicker@ds.mpg.de>
 """
 from .base import FreeEnergyBase
+from .base_jax import FreeEnergyJAX
 from .flory_huggins import FloryHuggins
@@ -0,0 +1,258 @@
+"""The implementation details of the compiled kernels for free energies.
+
+:mod:`~flory.free_energy._base_impl` contains the implementation details of the module
+:mod:`~flory.free_energy.base`, mainly the kernels for analyzing the local stability of
+mixtures from their Hessians.
+
+In this module, arguments of functions are always marked by `Constant`, `Output` or
+`Mutable`, to indicate whether the arguments will be kept invariant, directly overwritten,
+or reused.
+
+.. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
+"""
+
+from __future__ import annotations
+
+import numba as nb
+import numpy as np
+
+# growth factor of the Bunch-Kaufman pivoting strategy
+_BUNCH_KAUFMAN_ALPHA = (1.0 + np.sqrt(17.0)) / 8.0
+
+
+@nb.njit(cache=True)
+def count_negative_pivots(mat: np.ndarray) -> int:
+    r"""Count the negative eigenvalues of a symmetric matrix from its inertia.
+
+    The matrix is decomposed as :math:`P A P^T = L D L^T` using the Bunch-Kaufman
+    diagonal pivoting strategy, where :math:`D` is block-diagonal with blocks of size 1 or
+    2. According to Sylvester's law of inertia, :math:`A` and :math:`D` have the same
+    number of negative eigenvalues, which can be read off the blocks of :math:`D`
+    directly. This is considerably cheaper than a full diagonalization.
+
+    Args:
+        mat:
+            Mutable. 2D array with the size of :math:`N \times N`, containing the
+            symmetric matrix. The content is destroyed by the decomposition.
+
+    Returns:
+        : Number of negative eigenvalues of :paramref:`mat`.
+    """
+    n = mat.shape[0]
+    count = 0
+    k = 0
+    while k < n:
+        # find the largest off-diagonal element in column k
+        absakk = abs(mat[k, k])
+        imax = k
+        colmax = 0.0
+        for i in range(k + 1, n):
+            if abs(mat[i, k]) > colmax:
+                colmax = abs(mat[i, k])
+                imax = i
+
+        if max(absakk, colmax) == 0.0:
+            # the column vanishes, which corresponds to a zero eigenvalue
+            k += 1
+            continue
+
+        # determine the pivot
+        kstep = 1
+        kp = k
+        if absakk < _BUNCH_KAUFMAN_ALPHA * colmax:
+            rowmax = 0.0
+            for j in range(k, n):
+                if j != imax and abs(mat[imax, j]) > rowmax:
+                    rowmax = abs(mat[imax, j])
+            if absakk >= _BUNCH_KAUFMAN_ALPHA * colmax * (colmax / rowmax):
+                pass
+            elif abs(mat[imax, imax]) >= _BUNCH_KAUFMAN_ALPHA * rowmax:
+                kp = imax
+            else:
+                kp = imax
+                kstep = 2
+
+        # symmetric permutation of the rows and columns kk and kp
+        kk = k + kstep - 1
+        if kp != kk:
+            for j in range(n):
+                mat[kk, j], mat[kp, j] = mat[kp, j], mat[kk, j]
+            for i in range(n):
+                mat[i, kk], mat[i, kp] = mat[i, kp], mat[i, kk]
+
+        # count the negative eigenvalues of the pivot and update the trailing matrix
+        if kstep == 1:
+            d = mat[k, k]
+            if d < 0:
+                count += 1
+            for i in range(k + 1, n):
+                factor = mat[i, k] / d
+                for j in range(k + 1, n):
+                    mat[i, j] -= factor * mat[k, j]
+        else:
+            d11 = mat[k, k]
+            d21 = mat[k + 1, k]
+            d22 = mat[k + 1, k + 1]
+            det = d11 * d22 - d21 * d21
+            if det < 0:
+                count += 1
+            elif d11 + d22 < 0:
+                count += 2
+            for i in range(k + 2, n):
+                factor1 = (mat[i, k] * d22 - mat[i, k + 1] * d21) / det
+                factor2 = (mat[i, k + 1] * d11 - mat[i, k] * d21) / det
+                for j in range(k + 2, n):
+                    mat[i, j] -= factor1 * mat[k, j] + factor2 * mat[k + 1, j]
+        k += kstep
+    return count
+
+
+@nb.njit(cache=True)
+def count_negative_eigenvalues(mats: np.ndarray) -> np.ndarray:
+    r"""Count the negative eigenvalues of a batch of symmetric matrices.
+
+    See :func:`count_negative_pivots` for the details of the algorithm.
+
+    Args:
+        mats:
+            Constant. 3D array with the size of :math:`N_\mathrm{B} \times N \times N`,
+            containing the symmetric matrices.
+
+    Returns:
+        : 1D array with the size of :math:`N_\mathrm{B}`, containing the number of
+        negative eigenvalues of each matrix.
+    """
+    num_batch, n, _ = mats.shape
+    ans = np.zeros(num_batch, dtype=np.int64)
+    workspace = np.empty((n, n), dtype=mats.dtype)
+    for itr in range(num_batch):
+        workspace[:] = mats[itr]
+        ans[itr] = count_negative_pivots(workspace)
+    return ans
+
+
+@nb.njit(cache=True)
+def is_positive_definite(mat: np.ndarray) -> bool:
+    r"""Check whether a symmetric matrix is positive definite.
+
+    The lower triangle of the matrix is decomposed as :math:`A = L D L^T` without
+    pivoting, which is equivalent to a Cholesky decomposition. The matrix is positive
+    definite if and only if all pivots are positive, so the decomposition is aborted at
+    the first pivot that is not. This requires roughly a third of the operations of
+    :func:`count_negative_pivots`, but cannot count the negative eigenvalues.
+
+    Args:
+        mat:
+            Mutable. 2D array with the size of :math:`N \times N`, containing the
+            symmetric matrix. The content is destroyed by the decomposition.
+
+    Returns:
+        : Whether :paramref:`mat` is positive definite.
+    """
+    n = mat.shape[0]
+    for k in range(n):
+        d = mat[k, k]
+        if not d > 0:  # also catches NaN
+            return False
+        for i in range(k + 1, n):
+            factor = mat[i, k] / d
+            for j in range(k + 1, i + 1):
+                mat[i, j] -= factor * mat[j, k]
+    return True
+
+
+@nb.njit(cache=True)
+def has_negative_diagonal(mat: np.ndarray) -> bool:
+    r"""Check whether a symmetric matrix has a negative diagonal element.
+
+    A negative diagonal element implies a negative eigenvalue, since :math:`A_{ii} =
+    e_i^T A e_i` is bounded from below by the smallest eigenvalue. This test only requires
+    a pass over the diagonal and identifies many unstable matrices without a
+    decomposition.
+
+    Args:
+        mat:
+            Constant. 2D array with the size of :math:`N \times N`, containing the
+            symmetric matrix.
+
+    Returns:
+        : Whether any diagonal element of :paramref:`mat` is negative.
+    """
+    for i in range(mat.shape[0]):  # noqa: SIM110, numba cannot compile any(genexpr)
+        if mat[i, i] < 0:
+            return True
+    return False
+
+
+@nb.njit(cache=True)
+def check_stability(mats: np.ndarray) -> np.ndarray:
+    r"""Check whether a batch of symmetric matrices has no negative eigenvalues.
+
+    Matrices with negative diagonal elements are rejected by :func:`has_negative_diagonal`
+    first. The remaining matrices are tested by :func:`is_positive_definite`. Only if this
+    test fails, e.g. due to negative or vanishing eigenvalues, the negative eigenvalues are
+    counted by :func:`count_negative_pivots`, such that positive semi-definite matrices are
+    considered as stable as well.
+
+    Args:
+        mats:
+            Constant. 3D array with the size of :math:`N_\mathrm{B} \times N \times N`,
+            containing the symmetric matrices.
+
+    Returns:
+        : 1D boolean array with the size of :math:`N_\mathrm{B}`, indicating whether
+        each matrix has no negative eigenvalues.
+    """
+    num_batch, n, _ = mats.shape
+    ans = np.empty(num_batch, dtype=np.bool_)
+    workspace = np.empty((n, n), dtype=mats.dtype)
+    for itr in range(num_batch):
+        if has_negative_diagonal(mats[itr]):
+            ans[itr] = False
+            continue
+        workspace[:] = mats[itr]
+        if is_positive_definite(workspace):
+            ans[itr] = True
+        else:
+            workspace[:] = mats[itr]
+            ans[itr] = count_negative_pivots(workspace) == 0
+    return ans
+
+
+@nb.njit(cache=True)
+def reduce_hessian(hessians: np.ndarray, index: int, out: np.ndarray) -> None:
+    r"""Eliminate a dependent component from a batch of Hessians.
+
+    When component :paramref:`index` is dependent due to volume conservation, the chain
+    rule gives the reduced Hessian
+
+    .. math::
+        \tilde{H}_{ij} = H_{ij} - H_{kj} - H_{ik} + H_{kk},
+
+    where :math:`k` is the dependent component and :math:`i, j \ne k`. The four terms
+    are combined in a single pass, without creating temporaries. Since this is a
+    symmetric rank-2 update of :math:`H`, the terms are grouped as :math:`(H_{ij} +
+    H_{kk}) - (H_{kj} + H_{ik})`, such that the result is exactly symmetric in floating
+    point arithmetic whenever :paramref:`hessians` is.
+
+    Args:
+        hessians:
+            Constant. 3D array with the size of :math:`N_\mathrm{B} \times N \times N`,
+            containing the full Hessians.
+        index:
+            Constant. Non-negative index of the dependent component.
+        out:
+            Output. 3D array with the size of :math:`N_\mathrm{B} \times (N-1) \times
+            (N-1)`, containing the reduced Hessians.
+    """
+    num_batch, n, _ = hessians.shape
+    for itr in range(num_batch):
+        hkk = hessians[itr, index, index]
+        for i in range(n - 1):
+            ii = i if i < index else i + 1
+            hik = hessians[itr, ii, index]
+            for j in range(n - 1):
+                jj = j if j < index else j + 1
+                out[itr, i, j] = (hessians[itr, ii, jj] + hkk) - (
+                    hessians[itr, index, jj] + hik
+                )
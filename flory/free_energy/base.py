@@ -6,13 +6,70 @@
 
 from __future__ import annotations
 
+import functools
+import inspect
 import logging
+from typing import Callable
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from ..common import *
 from ..entropy import EntropyBase
 from ..interaction import InteractionBase
+from ._base_impl import (
+    check_stability,
+    count_negative_eigenvalues,
+    reduce_hessian,
+)
+
+
+@functools.cache
+def _accepts_out(method: Callable) -> bool:
+    """Check whether a method accepts the keyword argument `out`.
+
+    Args:
+        method:
+            The unbound method to check.
+
+    Returns:
+        : Whether :paramref:`method` accepts `out`, either explicitly or by `**kwargs`.
+    """
+    parameters = inspect.signature(method).parameters.values()
+    return any(
+        p.name == "out" or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters
+    )
+
+
+def _hessian_into(
+    part: InteractionBase | EntropyBase | FreeEnergyBase,
+    phis: np.ndarray,
+    out: np.ndarray,
+) -> np.ndarray:
+    """Write the Hessian of an interaction, entropy or free energy to an array.
+
+    Implementations of `_hessian_impl` may ignore `out` and return a new array, or may not
+    accept `out` at all, since older implementations only take the volume fractions.
+    Therefore, the returned array is copied to :paramref:`out` when necessary.
+
+    Args:
+        part:
+            Constant. The interaction, entropy or free energy instance.
+        phis:
+            Constant. The volume fractions of the phase(s).
+        out:
+            Output. Array with the shape of the full Hessian.
+
+    Returns:
+        : The array :paramref:`out` containing the Hessian.
+    """
+    if _accepts_out(type(part)._hessian_impl):
+        hessian = part._hessian_impl(phis, out=out)
+    else:
+        hessian = part._hessian_impl(phis)
+    if hessian is not out:
+        out[...] = hessian
+    return out
 
 
 class FreeEnergyBase:
@@ -32,7 +89,7 @@ class FreeEnergyBase:
             entropy:
                 The entropic energy instance.
         """
-        self._logger = logging.getLogger(self.__class__.__name__)
+        self._init_num_comp(interaction.num_comp)
         if interaction.num_comp != entropy.num_comp:
             self._logger.error(
                 "Interactions requires %d components while entropy requires %d.",
@@ -44,7 +101,24 @@ class FreeEnergyBase:
             )
         self.interaction = interaction
         self.entropy = entropy
-        self.num_comp = interaction.num_comp
+
+    def _init_num_comp(self, num_comp: int) -> None:
+        """Initialize the attributes that only depend on the number of components.
+
+        Besides the logger and :attr:`num_comp`, the indices of the independent
+        components are stored for each possible choice of the dependent component in a
+        conserved system. Subclasses that are not built from an interaction and an entropy
+        instance call this method instead of :meth:`__init__`.
+
+        Args:
+            num_comp:
+                Number of components.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.num_comp = num_comp
+        self._independent_indices = [
+            np.delete(np.arange(self.num_comp), index) for index in range(self.num_comp)
+        ]
 
     def interaction_compiled(self, **kwargs_full) -> InteractionBase:
         """Get the compiled instance of the interaction.
@@ -113,7 +187,9 @@ class FreeEnergyBase:
         """
         return self.interaction._jacobian_impl(phis) + self.entropy._jacobian_impl(phis)
 
-    def _hessian_impl(self, phis: np.ndarray) -> np.ndarray:
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         r"""Implementation of calculating Hessian :math:`\partial^2 f/\partial \phi_i^2`.
 
         This method is general, thus does not need to be overwritten. The method makes use
@@ -121,18 +197,27 @@ class FreeEnergyBase:
         :class:`~flory.interaction.base.InteractionBase` and
         :meth:`~flory.entropy.base.EntropyBase._hessian_impl` in
         :class:`~flory.entropy.base.EntropyBase`. Consider define custom interaction or
-        entropy if a custom free energy is needed.
+        entropy if a custom free energy is needed. The interaction Hessian is written to
+        the result directly, such that only the entropy Hessian requires a temporary.
 
         Args:
             phis:
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
                 phases are included, the index of the components must be the last
                 dimension.
+            out:
+                Optional array with the shape of the full Hessian, to which the result is
+                written.
 
         Returns:
             : The full Hessian.
         """
-        return self.interaction._hessian_impl(phis) + self.entropy._hessian_impl(phis)
+        shape = phis.shape + (self.num_comp,)
+        if out is None:
+            out = np.empty(shape)
+        _hessian_into(self.interaction, phis, out)
+        h_entropy = _hessian_into(self.entropy, phis, np.empty(shape))
+        return np.add(out, h_entropy, out=out)
 
     def check_volume_fractions(self, phis: np.ndarray, axis: int = -1) -> np.ndarray:
         r"""Check whether volume fractions are valid.
@@ -150,9 +235,10 @@ class FreeEnergyBase:
                 :paramref:`phis` is considered as the index of components.
 
         Returns:
-            : The volume fractions :paramref:`phis`
+            : The volume fractions :paramref:`phis` as a C-contiguous array of double
+            precision. No copy is made if :paramref:`phis` is already such an array.
         """
-        phis = np.asanyarray(phis)
+        phis = np.ascontiguousarray(phis, dtype=np.float64)
 
         if phis.shape[axis] != self.num_comp:
             self._logger.error(
@@ -162,8 +248,14 @@ class FreeEnergyBase:
             )
             raise VolumeFractionError("Invalid size for volume fractions")
 
-        if np.any(phis < 0):
-            self._logger.error("Volume fractions %s contain negative values.", phis)
+        # a reduction avoids creating a boolean temporary of the size of `phis`
+        phis_min = phis.min() if phis.size > 0 else 0.0
+        if phis_min < 0:
+            self._logger.error(
+                "Volume fractions contain negative values (shape=%s, min=%.3g).",
+                phis.shape,
+                phis_min,
+            )
             raise VolumeFractionError("Volume fractions must be all positive")
         return phis
 
@@ -209,11 +301,16 @@ class FreeEnergyBase:
         if index is None:
             return j_full
         else:
-            return (
-                np.delete(j_full, index, axis=-1) - j_full[..., index, None]
-            )  # chain rule
-
-    def hessian(self, phis: np.ndarray, index: int | None = None) -> np.ndarray:
+            keep = self._independent_indices[index]
+            return j_full[..., keep] - j_full[..., index, None]  # chain rule
+
+    def hessian(
+        self,
+        phis: np.ndarray,
+        index: int | None = None,
+        *,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
         r"""Calculate the Hessian with/without volume conservation.
 
         If parameter :paramref:`index` is specified, the system will be considered as
@@ -231,23 +328,142 @@ class FreeEnergyBase:
                 dimension.
             index:
                 Index of the dependent component. By default the system is not conserved.
+            out:
+                Optional C-contiguous array of double precision with the shape of the
+                result, to which the Hessian is written. Passing the same array in
+                repeated calls avoids allocating the result each time.
 
         Returns:
             : The Hessian with/without volume conservation.
         """
         phis = self.check_volume_fractions(phis)
-        h_full = self._hessian_impl(phis)
+        num_indep = self.num_comp if index is None else self.num_comp - 1
+        shape = phis.shape[:-1] + (num_indep, num_indep)
+        if out is not None:
+            self._check_hessian_array(out, shape, np.float64)
+
         if index is None:
-            return h_full
+            if out is None:
+                return self._hessian_impl(phis)
+            # subclasses may override `_hessian_impl` without supporting `out`
+            return _hessian_into(self, phis, out)
         else:
-            h_reduced_full = (
-                h_full
-                - h_full[..., index, None, :]
-                - h_full[..., :, index, None]
-                + h_full[..., index, None, index, None]
-            )  # chain rule
+            if out is None:
+                out = np.empty(shape)
+            index = range(self.num_comp)[index]  # normalize negative index
+            return self._reduce_hessian_impl(self._hessian_impl(phis), index, out)
+
+    def _check_hessian_array(
+        self, arr: np.ndarray, shape: tuple[int, ...], dtype: DTypeLike
+    ) -> None:
+        """Check whether an array provided by the caller can hold Hessians.
+
+        An exception will be raised if :paramref:`arr` does not have the given shape and
+        type, or if it is not a writeable C-contiguous array.
+
+        Args:
+            arr:
+                The array to check.
+            shape:
+                The shape of the Hessians.
+            dtype:
+                The floating point type of the Hessians.
+        """
+        if (
+            arr.shape != shape
+            or arr.dtype != dtype
+            or not arr.flags.c_contiguous
+            or not arr.flags.writeable
+        ):
+            self._logger.error(
+                "Array with shape %s and dtype %s cannot hold Hessians of shape %s and "
+                "dtype %s.",
+                arr.shape,
+                arr.dtype,
+                shape,
+                np.dtype(dtype),
+            )
+            raise ValueError("Invalid array for Hessians")
+
+    def _reduce_hessian_impl(
+        self, h_full: np.ndarray, index: int, out: np.ndarray
+    ) -> np.ndarray:
+        r"""Implementation of eliminating the dependent component from full Hessians.
+
+        The chain rule and the removal of the dependent component are done in one compiled
+        pass, see :func:`~flory.free_energy._base_impl.reduce_hessian`.
+
+        Args:
+            h_full:
+                The full Hessians, where the indices of the components are the last two
+                dimensions.
+            index:
+                Non-negative index of the dependent component.
+            out:
+                C-contiguous floating point array with the shape of the reduced Hessians,
+                to which the result is written.
+
+        Returns:
+            : The array :paramref:`out` containing the reduced Hessians.
+        """
+        num_indep = self.num_comp - 1
+        h_batch = h_full.reshape((-1, self.num_comp, self.num_comp))
+        ans = out.reshape((-1, num_indep, num_indep))  # view of C-contiguous `out`
+        reduce_hessian(h_batch, index, ans)
+        return out
+
+    def free_energy_and_jacobian(
+        self, phis: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        r"""Calculate the free energy density and the full Jacobian together.
+
+        The volume fractions are only validated once. The results can be passed to
+        :meth:`chemical_potentials_from` to avoid evaluating the free energy again.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+
+        Returns:
+            [0]: Free energy density of each phase.
+            [1]: Jacobian of each phase without volume conservation.
+        """
+        phis = self.check_volume_fractions(phis)
+        return self._energy_impl(phis), self._jacobian_impl(phis)
+
+    def chemical_potentials_from(
+        self, phis: np.ndarray, f: np.ndarray, j: np.ndarray
+    ) -> np.ndarray:
+        r"""Calculate original chemical potentials from known free energy and Jacobian.
+
+        This method is useful when the free energy density and the Jacobian are already
+        known, e.g. from :meth:`free_energy_and_jacobian`. Note that the volume fractions
+        are not validated.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+            f:
+                Free energy density of each phase, see :meth:`free_energy_density`.
+            j:
+                Jacobian of each phase without volume conservation, see
+                :meth:`jacobian`.
 
-            return np.delete(np.delete(h_reduced_full, index, axis=-1), index, axis=-2)
+        Returns:
+            : The original chemical potentials.
+        """
+        phis = np.asarray(phis)
+        j = np.asarray(j)
+        # batched dot product of phis and j, keeping a trailing axis for broadcasting
+        dot = (phis[..., None, :] @ j[..., :, None])[..., 0]
+        # combine the terms of size one first, such that only the result has full size
+        shift = np.atleast_1d(f)[..., None] - dot
+        ans = np.add(j, shift)
+        return ans
 
     def chemical_potentials(self, phis: np.ndarray) -> np.ndarray:
         r"""Calculate original chemical potentials by unit volume.
@@ -261,14 +477,11 @@ class FreeEnergyBase:
         Returns:
             : The original chemical potentials.
         """
-        f = self.free_energy_density(phis)
-        j = self.jacobian(phis)
-        ans = (
-            np.atleast_1d(f)[..., None]
-            - np.einsum("...i,...i->...", phis, j)[..., None]
-            + j
-        )
-        return ans
+        phis = self.check_volume_fractions(phis)
+        # phis are validated only once, so the implementations are called directly
+        f = self._energy_impl(phis)
+        j = self._jacobian_impl(phis)
+        return self.chemical_potentials_from(phis, f, j)
 
     def exchange_chemical_potentials(self, phis: np.ndarray, index: int) -> np.ndarray:
         r"""Calculate exchange chemical potentials.
@@ -313,8 +526,56 @@ class FreeEnergyBase:
         mus = self.chemical_potentials(phis)
         return -mus[..., index]
 
+    def _stability_hessians(
+        self,
+        phis: np.ndarray,
+        conserved: bool,
+        dtype: DTypeLike,
+        workspace: np.ndarray | None,
+    ) -> np.ndarray:
+        r"""Calculate the Hessians for the stability analysis as a batch.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+            conserved:
+                Whether the system conserves volume.
+            dtype:
+                The floating point type of the result.
+            workspace:
+                Optional array to which the Hessians are written, see
+                :meth:`num_unstable_modes`.
+
+        Returns:
+            : 3D array containing the Hessians of all phases.
+        """
+        phis = self.check_volume_fractions(phis)
+        num_indep = self.num_comp - 1 if conserved else self.num_comp
+        shape = phis.shape[:-1] + (num_indep, num_indep)
+        if workspace is None:
+            workspace = np.empty(shape, dtype=dtype)
+        else:
+            self._check_hessian_array(workspace, shape, dtype)
+
+        # phis are validated only once, so the implementations are called directly
+        if conserved:
+            self._reduce_hessian_impl(self._hessian_impl(phis), 0, workspace)
+        elif workspace.dtype == np.float64:
+            _hessian_into(self, phis, workspace)
+        else:
+            # the Hessians are summed in double precision before they are converted
+            workspace[...] = self._hessian_impl(phis)
+        return workspace.reshape((-1, num_indep, num_indep))
+
     def num_unstable_modes(
-        self, phis: np.ndarray, conserved: bool = True
+        self,
+        phis: np.ndarray,
+        conserved: bool = True,
+        *,
+        dtype: DTypeLike = np.float64,
+        workspace: np.ndarray | None = None,
     ) -> int | np.ndarray:
         r"""Count the number of unstable modes with/without volume conservation.
 
@@ -327,16 +588,41 @@ class FreeEnergyBase:
                 Whether the system conserves volume. If `True`, the first component is
                 considered as the dependent on when calculating the Hessian. See
                 :meth:`hessian` for more information.
+            dtype:
+                The floating point type used for counting the negative eigenvalues. A
+                single precision type such as :class:`numpy.float32` halves the memory
+                traffic for a large number of phases, but the result may be wrong for
+                compositions very close to the spinodal.
+            workspace:
+                Optional C-contiguous array of type :paramref:`dtype` with the shape of
+                the Hessians analyzed, see :meth:`hessian`, to which the Hessians are
+                written. Passing the same array in repeated calls, e.g. when scanning
+                many compositions in batches of equal size, avoids allocating the
+                Hessians each time. Its content is overwritten.
 
         Returns:
             : The number of negative eigenvalues of the Hessian.
         """
-        eigenvalues = np.linalg.eigvalsh(self.hessian(phis, 0 if conserved else None))
-        return np.sum(eigenvalues < 0, axis=-1).astype(int)
-
-    def is_stable(self, phis: np.ndarray, conserved: bool = True) -> int | np.ndarray:
+        hessians = self._stability_hessians(phis, conserved, dtype, workspace)
+        # the signs of the eigenvalues are obtained from the inertia of the Hessian
+        counts = count_negative_eigenvalues(hessians)
+        return counts.reshape(np.shape(phis)[:-1])[()]
+
+    def is_stable(
+        self,
+        phis: np.ndarray,
+        conserved: bool = True,
+        *,
+        dtype: DTypeLike = np.float64,
+        workspace: np.ndarray | None = None,
+    ) -> bool | np.ndarray:
         r"""Determine whether the mixture is locally stable.
 
+        The mixture is stable if the Hessian has no negative eigenvalues. Positive
+        definite Hessians are detected by a Cholesky decomposition, which is cheaper than
+        counting the unstable modes by :meth:`num_unstable_modes`. The modes are only
+        counted when the decomposition fails.
+
         Args:
             phis:
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
@@ -346,8 +632,16 @@ class FreeEnergyBase:
                 Whether the system conserves volume. If `True`, the first component is
                 considered as the dependent on when calculating the Hessian. See
                 :meth:`hessian` for more information.
+            dtype:
+                The floating point type used for the stability analysis. See
+                :meth:`num_unstable_modes` for more information.
+            workspace:
+                Optional array to which the Hessians are written. See
+                :meth:`num_unstable_modes` for more information.
 
         Returns:
-            : The number of negative eigenvalues of the Hessian.
+            : Whether the Hessian has no negative eigenvalues.
         """
-        return self.num_unstable_modes(phis, conserved) == 0
+        hessians = self._stability_hessians(phis, conserved, dtype, workspace)
+        stable = check_stability(hessians)
+        return stable.reshape(np.shape(phis)[:-1])[()]
@@ -0,0 +1,170 @@
+"""Module for a general free energy of mixture differentiated by :mod:`jax`.
+
+The class :class:`FreeEnergyJAX` mirrors :class:`~flory.free_energy.base.FreeEnergyBase`,
+but only requires the interaction energy and the entropic energy to be given as pure
+functions of the volume fractions of a single phase. The Jacobian and the Hessian are then
+obtained by automatic differentiation, and all functions are compiled by :func:`jax.jit`,
+such that they can also be executed on accelerators. Note that :mod:`jax` is an optional
+dependency of :mod:`flory`. Double precision is only used by :mod:`jax` if the option
+:code:`jax_enable_x64` is set.
+
+.. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+from .base import FreeEnergyBase
+
+
+def _import_jax() -> tuple:
+    """Import the optional package :mod:`jax` on first use.
+
+    Importing :mod:`jax` is slow, so it is deferred until :class:`FreeEnergyJAX` is
+    actually used instead of happening on :code:`import flory`.
+
+    Returns:
+        [0]: The module :mod:`jax`.
+        [1]: The module :mod:`jax.numpy`.
+    """
+    try:
+        import jax
+        import jax.numpy as jnp
+    except ImportError as err:
+        raise ImportError("Class `FreeEnergyJAX` requires the package `jax`.") from err
+    return jax, jnp
+
+
+class FreeEnergyJAX(FreeEnergyBase):
+    r"""Class for a general free energy of mixture differentiated by :mod:`jax`.
+
+    The free energy density is the sum of the interaction energy and the entropic energy,
+    which are both pure functions mapping the volume fractions :math:`\phi_i` of a single
+    phase to a scalar. These functions must be traceable by :mod:`jax`, e.g. by using
+    :mod:`jax.numpy` instead of :mod:`numpy`. Multiple phases are handled by vectorizing
+    the functions automatically. Since the energies are not given as instances of
+    :class:`~flory.interaction.base.InteractionBase` and
+    :class:`~flory.entropy.base.EntropyBase`, this class cannot provide compiled instances
+    for :class:`~flory.mcmp.finder.CoexistingPhasesFinder`.
+    """
+
+    def __init__(
+        self,
+        num_comp: int,
+        interaction_energy: Callable,
+        entropy_energy: Callable,
+    ):
+        r"""
+        Args:
+            num_comp:
+                Number of components :math:`N_\mathrm{C}`.
+            interaction_energy:
+                The pure function for the interaction energy density
+                :math:`f_\mathrm{interaction}(\{\phi_i\})` of a single phase.
+            entropy_energy:
+                The pure function for the entropic energy density
+                :math:`f_\mathrm{entropy}(\{\phi_i\})` of a single phase.
+        """
+        jax, jnp = _import_jax()
+        self._init_num_comp(num_comp)
+        self.interaction_energy = interaction_energy
+        self.entropy_energy = entropy_energy
+
+        def energy(phis):
+            return interaction_energy(phis) + entropy_energy(phis)
+
+        self._energy_jit = jax.jit(jnp.vectorize(energy, signature="(n)->()"))
+        self._jacobian_jit = jax.jit(
+            jnp.vectorize(jax.grad(energy), signature="(n)->(n)")
+        )
+        self._hessian_jit = jax.jit(
+            jnp.vectorize(jax.hessian(energy), signature="(n)->(n,n)")
+        )
+
+    @classmethod
+    def from_flory_huggins(
+        cls,
+        num_comp: int,
+        chis: np.ndarray | float,
+        sizes: np.ndarray | None = None,
+    ):
+        r"""Create the Flory-Huggins free energy.
+
+        See :class:`~flory.free_energy.flory_huggins.FloryHuggins` for the form of the
+        free energy and the parameter details.
+        """
+        _, jnp = _import_jax()
+        chis = np.array(np.broadcast_to(np.atleast_1d(chis), (num_comp, num_comp)))
+        chis = jnp.asarray(0.5 * (chis + chis.T))
+        if sizes is None:
+            sizes = np.ones(num_comp)
+        sizes = jnp.asarray(np.broadcast_to(np.atleast_1d(sizes), (num_comp,)))
+
+        def interaction_energy(phis):
+            return 0.5 * phis @ chis @ phis
+
+        def entropy_energy(phis):
+            return jnp.sum(phis / sizes * jnp.log(phis))
+
+        return cls(num_comp, interaction_energy, entropy_energy)
+
+    def interaction_compiled(self, **kwargs_full):
+        """Not available, see class :class:`FreeEnergyJAX`."""
+        raise NotImplementedError("Interaction of `FreeEnergyJAX` can not be compiled.")
+
+    def entropy_compiled(self, **kwargs_full):
+        """Not available, see class :class:`FreeEnergyJAX`."""
+        raise NotImplementedError("Entropy of `FreeEnergyJAX` can not be compiled.")
+
+    def _energy_impl(self, phis: np.ndarray) -> np.ndarray:
+        r"""Implementation of calculating free energy :math:`f`.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+
+        Returns:
+            : The free energy density.
+        """
+        return np.asarray(self._energy_jit(phis))
+
+    def _jacobian_impl(self, phis: np.ndarray) -> np.ndarray:
+        r"""Implementation of calculating Jacobian :math:`\partial f/\partial \phi_i`.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+
+        Returns:
+            : The full Jacobian.
+        """
+        return np.array(self._jacobian_jit(phis))
+
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        r"""Implementation of calculating Hessian :math:`\partial^2 f/\partial \phi_i^2`.
+
+        Args:
+            phis:
+                The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
+                phases are included, the index of the components must be the last
+                dimension.
+            out:
+                Optional array with the shape of the full Hessian, to which the result is
+                written.
+
+        Returns:
+            : The full Hessian.
+        """
+        if out is None:
+            return np.array(self._hessian_jit(phis))
+        out[...] = self._hessian_jit(phis)
+        return out
@@ -161,7 +161,9 @@ class InteractionBase:
         """
         raise NotImplementedError
 
-    def _hessian_impl(self, phis: np.ndarray) -> np.ndarray:
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         r"""Implementation of calculating Hessian :math:`\partial^2 f_\mathrm{interaction}/\partial \phi_i^2` (Interface).
 
         This interface is meant to be overridden in derived classes. Multiple compositions
@@ -172,6 +174,9 @@ class InteractionBase:
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
                 phases are included, the index of the components must be the last
                 dimension.
+            out:
+                Optional array with the shape of the full Hessian. If given, the result
+                must be written to it and it is returned.
                 
         Returns:
             : The full Hessian.
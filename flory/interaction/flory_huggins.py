@@ -99,10 +99,11 @@ class FloryHugginsInteractionBase(InteractionBase):
         super().__init__(num_comp=num_comp)
         self._logger = logging.getLogger(self.__class__.__name__)
 
-        chis = np.atleast_1d(chis)
+        chis = np.atleast_1d(np.asarray(chis, dtype=np.float64))
 
+        # the symmetrization below creates a new array, so a read-only view suffices
         shape = (num_comp, num_comp)
-        chis = np.array(np.broadcast_to(chis, shape))
+        chis = np.broadcast_to(chis, shape)
 
         # ensure that the chi matrix is symmetric
         if not np.allclose(chis, chis.T):
@@ -131,8 +132,9 @@ class FloryHugginsInteractionBase(InteractionBase):
             : Instance of :class:`FloryHugginsInteractionCompiled`.
         """
 
+        # copy so that in-place changes of `chis` cannot desynchronize `_incomp_coef`
         return FloryHugginsInteractionCompiled(
-            self._chis, -self._chis.min() + additional_chis_shift
+            np.array(self._chis), -self._chis.min() + additional_chis_shift
         )
 
     def _energy_impl(self, phis: np.ndarray) -> np.ndarray:
@@ -151,7 +153,8 @@ class FloryHugginsInteractionBase(InteractionBase):
         Returns:
             : The interaction energy density
         """
-        ans = 0.5 * np.einsum("...i,...j,ij->...", phis, phis, self._chis)
+        # contracting with chis first avoids the unoptimized three-operand einsum
+        ans = 0.5 * np.einsum("...i,...i->...", phis @ self._chis, phis)
         return ans
 
     def _jacobian_impl(self, phis: np.ndarray) -> np.ndarray:
@@ -173,7 +176,9 @@ class FloryHugginsInteractionBase(InteractionBase):
         ans = phis @ self._chis
         return ans
 
-    def _hessian_impl(self, phis: np.ndarray) -> np.ndarray:
+    def _hessian_impl(
+        self, phis: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
         r"""Implementation of calculating Hessian :math:`\partial^2 f_\mathrm{interaction}/\partial \phi_i^2`.
 
         This method overwrites the interface
@@ -185,11 +190,17 @@ class FloryHugginsInteractionBase(InteractionBase):
                 The volume fractions of the phase(s) :math:`\phi_{p,i}`. if multiple
                 phases are included, the index of the components must be the last
                 dimension.
+            out:
+                Optional array with the shape of the full Hessian, to which the result is
+                written.
 
         Returns:
             : The full Hessian
         """
-        return np.zeros_like(phis)[..., None] + self._chis  # type: ignore
+        if out is None:
+            out = np.empty(phis.shape + (self.num_comp,))
+        out[...] = self._chis
+        return out
 
 
 class FloryHugginsInteraction(FloryHugginsInteractionBase):
@@ -225,10 +236,13 @@ class FloryHugginsInteraction(FloryHugginsInteractionBase):
 
     @chis.setter
     def chis(self, chis_new: np.ndarray):
-        chis_new = np.atleast_1d(chis_new)
+        chis_new = np.atleast_1d(np.asarray(chis_new, dtype=np.float64))
         shape = (self.num_comp, self.num_comp)
-        chis_new = np.array(np.broadcast_to(chis_new, shape))
-        if not np.allclose(chis_new, chis_new.T):
+        chis_new = np.broadcast_to(chis_new, shape)
+        # the symmetry is only checked for the warning, so skip it if it is not shown
+        if self._logger.isEnabledFor(logging.WARNING) and not np.allclose(
+            chis_new, chis_new.T
+        ):
             self._logger.warning("Using symmetrized χ interaction-matrix")
         self._chis = 0.5 * (chis_new + chis_new.T)
 
@@ -310,7 +324,7 @@ class FloryHugginsInteraction(FloryHugginsInteractionBase):
                 Whether the diagonal elements of the :math:`\chi_{ij}` matrix are set to
                 be zero.
         """
-        self._chis = np.full((self.num_comp, self.num_comp), chi)
+        self._chis = np.full((self.num_comp, self.num_comp), chi, dtype=np.float64)
         if vanishing_diagonal:
             self._chis[np.diag_indices_from(self._chis)] = 0
 
@@ -338,7 +352,8 @@ class FloryHugginsInteraction(FloryHugginsInteractionBase):
         if rng is None:
             rng = np.random.default_rng()
 
-        self._chis[:] = 0  # reset old values
+        # a new array, such that compiled instances sharing the old one are not affected
+        self._chis = np.zeros((self.num_comp, self.num_comp))
 
         # determine random entries
         if vanishing_diagonal:
@@ -374,7 +389,7 @@ class FloryHugginsInteraction(FloryHugginsInteractionBase):
             : Instance of :class:`FloryHugginsInteractionCompiled`.
         """
 
+        # copy so that in-place changes of `chis` cannot desynchronize `_incomp_coef`
         return FloryHugginsInteractionCompiled(
-            self._chis.astype(np.float64),
-            -self._chis.astype(np.float64).min() + additional_chis_shift,
+            np.array(self._chis), -self._chis.min() + additional_chis_shift
         )
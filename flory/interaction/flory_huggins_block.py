@@ -94,8 +94,11 @@ class FloryHugginsBlockInteraction(FloryHugginsInteractionBase):
         chis_feat_new = convert_and_broadcast(
             chis_feat_new, (self._num_feat, self._num_feat)
         )
-        # ensure that the chi matrix is symmetric
-        if not np.allclose(chis_feat_new, chis_feat_new.T):
+        # ensure that the chi matrix is symmetric, the check is only needed for the
+        # warning, so skip it if it is not shown
+        if self._logger.isEnabledFor(logging.WARNING) and not np.allclose(
+            chis_feat_new, chis_feat_new.T
+        ):
             self._logger.warning("Using symmetrized χ interaction-matrix")
         chis_feat_new = 0.5 * (chis_feat_new + chis_feat_new.T)
         self._chis_feat = chis_feat_new
@@ -111,8 +111,8 @@ def revive_compartments_by_random(
     revive_count = 0
     num_comp, num_part = targets.shape
 
-    target_centers = np.full(num_comp, 0.0, float)
-    omega_widths = np.full(num_comp, 0.0, float)
+    target_centers = np.empty(num_comp)
+    omega_widths = np.empty(num_comp)
     for itr_component in range(num_comp):
         current_target_max = targets[itr_component].max()
         current_target_min = targets[itr_component].min()
@@ -124,10 +124,13 @@ def revive_compartments_by_random(
         if Js[itr_compartment] <= threshold:
             Js[itr_compartment] = 1.0
             revive_count += 1
+            # draw the random numbers of all components at once
+            noise = rng.uniform(-1, 1, num_comp)
             for itr_component in range(num_comp):
-                targets[itr_component, itr_compartment] = target_centers[
-                    itr_component
-                ] + omega_widths[itr_component] * scaler * rng.uniform(-1, 1)
+                targets[itr_component, itr_compartment] = (
+                    target_centers[itr_component]
+                    + omega_widths[itr_component] * scaler * noise[itr_component]
+                )
 
     return revive_count
 
@@ -172,9 +175,19 @@ def revive_compartments_by_copy(
     revive_count = 0
     num_comp, num_part = targets.shape
 
-    dead_indexes = np.full(num_part, -1, dtype=np.int32)
+    # typically no compartment is dead, so nothing needs to be allocated
+    has_dead = False
+    for itr_compartment in range(num_part):
+        if Js[itr_compartment] <= threshold:
+            has_dead = True
+            break
+    if not has_dead:
+        return revive_count
+
+    # only the leading entries up to the counts are used
+    dead_indexes = np.empty(num_part, dtype=np.int32)
     dead_count = 0
-    living_nicely_indexes = np.full(num_part, -1, dtype=np.int32)
+    living_nicely_indexes = np.empty(num_part, dtype=np.int32)
     living_nicely_count = 0
     for itr_compartment in range(num_part):
         if Js[itr_compartment] > 2.0 * threshold:
@@ -216,19 +229,26 @@ def multicomponent_self_consistent_metastep(
     Js: np.ndarray,
     phis_comp: np.ndarray,
     phis_feat: np.ndarray,
+    workspace: np.ndarray,
     steps_inner: int,
     acceptance_Js: float,
     Js_step_upper_bound: float,
     acceptance_omega: float,
     kill_threshold: float,
-    revive_tries: int,
+    revive_count_left: np.ndarray,
     revive_scaler: float,
     rng: np.random.Generator,
-) -> tuple[float, float, float, float, int, bool]:
+) -> tuple[float, float, float, float, bool]:
     r"""
     The core algorithm of finding coexisting states of multicomponent systems with
     self-consistent iterations.
 
+    The updates of the compartments are written as fused loops over the compartments,
+    which compute the maximal errors on the fly. The loops are deliberately serial: each
+    step only does :math:`\mathcal{O}(N_\mathrm{S} N_\mathrm{M})` work between the calls
+    to the compiled instances, which is too little to amortize the synchronization of
+    threads for typical numbers of compartments.
+
     Args:
         interaction:
             Constant. The compiled interaction instance. See
@@ -262,6 +282,11 @@ def multicomponent_self_consistent_metastep(
         phis_feat:
             Output. 2D array with size of :math:`N_\mathrm{S} \times N_\mathrm{M}`, containing the
             volume fractions of features :math:`\phi_r^{(m)}`.
+        workspace:
+            Mutable. 2D array with size of :math:`4 \times N_\mathrm{M}`, which is used as
+            the working memory for the quantities of the compartments. The content is
+            meaningless before and after the call. Passing the same array to repeated
+            calls avoids allocating memory.
         steps_inner:
             Constant. Number of steps in current routine. Within these steps, convergence
             is not checked and no output will be generated.
@@ -297,12 +322,11 @@ def multicomponent_self_consistent_metastep(
             to the internal mask. The dead compartment may be revived, depending on whether
             reviving is allowed or whether the number of the revive tries has been
             exhausted.
-        revive_tries:
-            Constant. Number of tries left to revive the dead compartment. 0 or negative
-            value indicates no reviving. When this value is exhausted, i.e. the number of
-            revive in current function call exceeds this value, the revive will be turned
-            off. Note that this function does not decrease this value, but returns the number
-            of revives that have happened after completion.
+        revive_count_left:
+            Mutable. 1D array with a single entry, containing the number of tries left to
+            revive the dead compartments. 0 or negative value indicates no reviving. The
+            entry is decreased by the number of revives in place. When it is exhausted,
+            the revive will be turned off.
         revive_scaler:
             Constant. The scaling factor for the conjugate fields :math:`w_r^{(m)}`
             when a dead compartment is revived. This value determines the range of the
@@ -317,34 +341,45 @@ def multicomponent_self_consistent_metastep(
         [1]: Max absolute conjugate field error.
         [2]: Max absolute relative volumes error.
         [3]: Max absolute constraints error.
-        [4]: Number of revives.
-        [5]: Whether no phase is killed in the last step.
+        [4]: Whether no phase is killed in the last step.
     """
     num_feat, num_part = omegas.shape
 
+    # buffers of the size of N_M, which are reused in all steps
+    masks = workspace[0]
+    xi = workspace[1]
+    local_energy = workspace[2]
+    Js_diff = workspace[3]
+
     n_valid_phase = 0
 
-    revive_count = 0
     for _ in range(steps_inner):
         # check if we are still allowed to revive compartments
-        if revive_count < revive_tries:
+        if revive_count_left[0] > 0:
             n_valid_phase = count_valid_compartments(Js, kill_threshold)
             if n_valid_phase != num_part:
                 # revive dead compartments
-                revive_count += revive_compartments_by_random(
+                revive_count_left[0] -= revive_compartments_by_random(
                     Js, omegas, kill_threshold, rng, revive_scaler
                 )
 
-        # generate masks for the compartments
-        masks = make_valid_compartment_masks(Js, kill_threshold)
-        n_valid_phase = int(masks.sum())
-        Js *= masks
+        # generate masks for the compartments and kill the dead ones
+        n_valid_phase = 0
+        for itr_part in range(num_part):
+            if Js[itr_part] > kill_threshold:
+                masks[itr_part] = 1.0
+                n_valid_phase += 1
+            else:
+                masks[itr_part] = 0.0
+                Js[itr_part] = 0.0
 
         # calculate volume fractions, single molecular partition function Q and incompressibility
         Qs = entropy.partition(phis_comp, omegas, Js)  # modifies phis_comp directly
         incomp = ensemble.normalize(phis_comp, Qs, masks)  # modifies phis_comp directly
         entropy.comp_to_feat(phis_feat, phis_comp)  # modifies phis_feat directly
-        max_abs_incomp = np.abs(incomp).max()
+        max_abs_incomp = 0.0
+        for itr_part in range(num_part):
+            max_abs_incomp = max(max_abs_incomp, abs(incomp[itr_part]))
 
         # prepare constraints: constraints are stateful
         if constraints:
@@ -355,57 +390,81 @@ def multicomponent_self_consistent_metastep(
         omega_temp = interaction.potential(phis_feat)
 
         # xi, the Lagrange multiplier
-        xi = interaction.incomp_coef(phis_feat) * incomp
+        np.multiply(interaction.incomp_coef(phis_feat), incomp, xi)
         for itr_feat in range(num_feat):
-            xi += omegas[itr_feat] - omega_temp[itr_feat]
+            for itr_part in range(num_part):
+                xi[itr_part] += (
+                    omegas[itr_feat, itr_part] - omega_temp[itr_feat, itr_part]
+                )
         for cons in literal_unroll(constraints):
             for itr_feat in range(num_feat):
                 xi -= cons.potential[
                     itr_feat
                 ]  # potential from constraints are already calculated in preparation.
-        xi *= masks
-        xi /= num_feat
-
-        # local energy. i.e. energy of phases excluding the partition function part
-        local_energy = (
-            interaction.volume_derivative(omega_temp, phis_feat)
-            + entropy.volume_derivative(phis_comp)
-            + xi * incomp
-        )
+
+        # local energy. i.e. energy of phases excluding the partition function part,
+        # which is accumulated in the same pass as the normalization of xi
+        interaction_energy = interaction.volume_derivative(omega_temp, phis_feat)
+        entropy_energy = entropy.volume_derivative(phis_comp)
+        for itr_part in range(num_part):
+            xi[itr_part] = xi[itr_part] * masks[itr_part] / num_feat
+            local_energy[itr_part] = (
+                interaction_energy[itr_part]
+                + entropy_energy[itr_part]
+                + xi[itr_part] * incomp[itr_part]
+            )
         for cons in literal_unroll(constraints):
             local_energy += (
                 cons.volume_derivative
             )  # volume_derivative from constraints are already calculated in preparation.
             omega_temp += cons.potential
         for itr_feat in range(num_feat):
-            omega_temp[itr_feat] += xi
-            local_energy -= omega_temp[itr_feat] * phis_feat[itr_feat]
+            for itr_part in range(num_part):
+                omega_temp[itr_feat, itr_part] += xi[itr_part]
+                local_energy[itr_part] -= (
+                    omega_temp[itr_feat, itr_part] * phis_feat[itr_feat, itr_part]
+                )
 
         # calculate the difference of Js
-        local_energy_mean = (local_energy * Js).sum() / n_valid_phase
-        Js_diff = (local_energy_mean - local_energy) * masks
-        max_abs_Js_diff = np.abs(Js_diff).max()
+        local_energy_mean = 0.0
+        for itr_part in range(num_part):
+            local_energy_mean += local_energy[itr_part] * Js[itr_part]
+        local_energy_mean /= n_valid_phase
+        max_abs_Js_diff = 0.0
+        for itr_part in range(num_part):
+            Js_diff[itr_part] = (local_energy_mean - local_energy[itr_part]) * masks[
+                itr_part
+            ]
+            max_abs_Js_diff = max(max_abs_Js_diff, abs(Js_diff[itr_part]))
 
         # calculate additional factor to scale down iteration
         Js_max_change = max(max_abs_Js_diff * acceptance_Js, Js_step_upper_bound)
         additional_factor = Js_step_upper_bound / Js_max_change
 
         # update Js
-        Js += additional_factor * acceptance_Js * Js_diff
-        Js *= masks
-        Js += 1 - (Js.sum() / n_valid_phase)
-        Js *= masks
+        Js_step = additional_factor * acceptance_Js
+        Js_sum = 0.0
+        for itr_part in range(num_part):
+            Js[itr_part] = masks[itr_part] * (
+                Js[itr_part] + Js_step * Js_diff[itr_part]
+            )
+            Js_sum += Js[itr_part]
+        Js_shift = 1 - Js_sum / n_valid_phase
+        for itr_part in range(num_part):
+            Js[itr_part] = (Js[itr_part] + Js_shift) * masks[itr_part]
 
         # calculate difference of omega and update omega directly
-        max_abs_omega_diff = 0
-        for itr_comp in range(num_feat):
-            omega_temp[itr_comp] -= omegas[itr_comp]
-            omega_temp[itr_comp] *= masks
-            max_abs_omega_diff = max(max_abs_omega_diff, omega_temp[itr_comp].max())
-            omegas[itr_comp] += (
-                additional_factor * acceptance_omega * omega_temp[itr_comp]
-            )
-            omegas[itr_comp] *= masks
+        omega_step = additional_factor * acceptance_omega
+        max_abs_omega_diff = 0.0
+        for itr_feat in range(num_feat):
+            for itr_part in range(num_part):
+                omega_diff = (
+                    omega_temp[itr_feat, itr_part] - omegas[itr_feat, itr_part]
+                ) * masks[itr_part]
+                max_abs_omega_diff = max(max_abs_omega_diff, omega_diff)
+                omegas[itr_feat, itr_part] = (
+                    omegas[itr_feat, itr_part] + omega_step * omega_diff
+                ) * masks[itr_part]
 
         max_constraint_residue = 0
         for cons in literal_unroll(constraints):
@@ -422,6 +481,173 @@ def multicomponent_self_consistent_metastep(
         max_abs_omega_diff,
         max_abs_Js_diff,
         max_constraint_residue,
-        revive_count,
         n_valid_phase == n_valid_phase_last,
     )
+
+
+@nb.njit()
+def update_converged_checks(
+    converged_checks: int,
+    tolerance: float,
+    max_abs_incomp: float,
+    max_abs_omega_diff: float,
+    max_abs_Js_diff: float,
+    max_constraint_residue: float,
+    is_last_step_safe: bool,
+) -> int:
+    r"""
+    Update the number of successive checks passing the "standard" convergence criterion.
+
+    The criterion of :class:`~flory.mcmp.finder.CoexistingPhasesFinder` is passed if the
+    number of valid compartments did not change in the last step and all metrics
+    returned by :func:`multicomponent_self_consistent_metastep` are below
+    :paramref:`tolerance`. Otherwise, the count is reset.
+
+    Args:
+        converged_checks:
+            Constant. Number of successive checks that have been passed before.
+        tolerance:
+            Constant. The tolerance to determine convergence.
+        max_abs_incomp:
+            Constant. Max absolute incompressibility in the last step.
+        max_abs_omega_diff:
+            Constant. Max absolute conjugate field error in the last step.
+        max_abs_Js_diff:
+            Constant. Max absolute relative volumes error in the last step.
+        max_constraint_residue:
+            Constant. Max absolute constraints error in the last step.
+        is_last_step_safe:
+            Constant. Whether the number of valid compartments did not change in the last
+            step.
+
+    Returns:
+        : Number of successive checks that have been passed, including this one.
+    """
+    if (
+        is_last_step_safe
+        and tolerance > max_abs_incomp
+        and tolerance > max_abs_omega_diff
+        and tolerance > max_abs_Js_diff
+        and tolerance > max_constraint_residue
+    ):
+        return converged_checks + 1
+    return 0
+
+
+@nb.njit()
+def multicomponent_self_consistent_run(
+    interaction: InteractionBaseCompiled,
+    entropy: EntropyBaseCompiled,
+    ensemble: EnsembleBaseCompiled,
+    constraints: tuple[ConstraintBaseCompiled],
+    *,
+    omegas: np.ndarray,
+    Js: np.ndarray,
+    phis_comp: np.ndarray,
+    phis_feat: np.ndarray,
+    workspace: np.ndarray,
+    steps_tracker: int,
+    steps_inner: int,
+    tolerance: float,
+    convergence_window: int,
+    converged_checks: int,
+    acceptance_Js: float,
+    Js_step_upper_bound: float,
+    acceptance_omega: float,
+    kill_threshold: float,
+    revive_count_left: np.ndarray,
+    revive_scaler: float,
+    rng: np.random.Generator,
+) -> tuple[int, int, float, float, float, float]:
+    r"""
+    Repeat :func:`multicomponent_self_consistent_metastep` until convergence.
+
+    The metastep is called at most :paramref:`steps_tracker` times, each time with
+    :paramref:`steps_inner` steps. After each call, the "standard" convergence criterion
+    of :class:`~flory.mcmp.finder.CoexistingPhasesFinder` is checked, and the iteration
+    stops once it has been passed by :paramref:`convergence_window` successive checks, see
+    :func:`update_converged_checks`. This is equivalent to the loop in
+    :meth:`~flory.mcmp.finder.CoexistingPhasesFinder.run`, but does not return to the
+    interpreter between the checks, and is therefore used when no progress needs to be
+    shown. Since the kernel cannot be interrupted, long iterations should be split into
+    several calls, passing on :paramref:`converged_checks`.
+
+    Args:
+        steps_tracker:
+            Constant. Maximal number of calls of the metastep, i.e. of the checks of
+            convergence.
+        steps_inner:
+            Constant. Number of steps in each call of the metastep.
+        tolerance:
+            Constant. The tolerance to determine convergence.
+        convergence_window:
+            Constant. Number of successive checks of convergence that must be passed.
+        converged_checks:
+            Constant. Number of successive checks that have been passed by previous
+            calls.
+
+    See :func:`multicomponent_self_consistent_metastep` for the other arguments.
+
+    Returns:
+        [0]: Number of steps that have been done.
+        [1]: Number of successive checks that have been passed. The iteration converged
+        if this is at least :paramref:`convergence_window`.
+        [2]: Max absolute incompressibility in the last step.
+        [3]: Max absolute conjugate field error in the last step.
+        [4]: Max absolute relative volumes error in the last step.
+        [5]: Max absolute constraints error in the last step.
+    """
+    steps = 0
+    max_abs_incomp = 0.0
+    max_abs_omega_diff = 0.0
+    max_abs_Js_diff = 0.0
+    max_constraint_residue = 0.0
+    for _ in range(steps_tracker):
+        (
+            max_abs_incomp,
+            max_abs_omega_diff,
+            max_abs_Js_diff,
+            max_constraint_residue,
+            is_last_step_safe,
+        ) = multicomponent_self_consistent_metastep(
+            # keyword-only arguments can not be passed by name in compiled code
+            interaction,
+            entropy,
+            ensemble,
+            constraints,
+            omegas,
+            Js,
+            phis_comp,
+            phis_feat,
+            workspace,
+            steps_inner,
+            acceptance_Js,
+            Js_step_upper_bound,
+            acceptance_omega,
+            kill_threshold,
+            revive_count_left,
+            revive_scaler,
+            rng,
+        )
+        steps += steps_inner
+
+        converged_checks = update_converged_checks(
+            converged_checks,
+            tolerance,
+            max_abs_incomp,
+            max_abs_omega_diff,
+            max_abs_Js_diff,
+            max_constraint_residue,
+            is_last_step_safe,
+        )
+        if converged_checks >= convergence_window:
+            break
+
+    return (
+        steps,
+        converged_checks,
+        max_abs_incomp,
+        max_abs_omega_diff,
+        max_abs_Js_diff,
+        max_constraint_residue,
+    )
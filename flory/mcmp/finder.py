@@ -34,6 +34,7 @@ See :ref:`Examples` for examples.
 from __future__ import annotations
 
 import logging
+import math
 import time
 from collections.abc import Iterable
 from datetime import datetime
@@ -49,6 +50,10 @@ from ..entropy import EntropyBase, EntropyBaseCompiled
 from ..interaction import FloryHugginsInteractionCompiled, InteractionBase
 from ._finder_impl import *
 
+# maximal number of steps done by a single call of the compiled iteration, after which
+# the interpreter regains control, e.g. to handle keyboard interrupts
+_MAX_STEPS_PER_CALL = 100_000
+
 
 class CoexistingPhasesFinder:
     r"""Class for a general finder of coexisting phases.
@@ -59,6 +64,11 @@ class CoexistingPhasesFinder:
     reuse the instance of this class is only possible when all the system sizes are not
     changed, including the number of components :math:`N_\mathrm{C}`, the number of
     features :math:`N_\mathrm{S}` and the number of compartments :math:`N_\mathrm{M}`.
+    All fields are stored in double precision, since the compiled instances of
+    interactions, entropies, ensembles and constraints are typed for double precision.
+    The core algorithm is compiled once for each combination of the types of the compiled
+    instances, but not for their parameters or the system sizes. Replacing instances by
+    ones of the same types therefore does not trigger a compilation.
     """
 
     def __init__(
@@ -74,6 +84,7 @@ class CoexistingPhasesFinder:
         convergence_criterion: str = "standard",
         tolerance: float = 1e-5,
         interval: int = 10_000,
+        convergence_window: int = 1,
         progress: bool = True,
         random_std: float = 5.0,
         acceptance_Js: float = 0.0002,
@@ -122,6 +133,13 @@ class CoexistingPhasesFinder:
             interval:
                 The interval of steps to check convergence. This value can be temporarily
                 overwritten, see :meth:`run` for more information.
+            convergence_window:
+                The number of successive checks of convergence that must be passed before
+                the iteration is considered converged. Values larger than 1 guard against
+                an accidental early exit, e.g. when a metric only transiently drops below
+                :paramref:`tolerance`, which in turn allows larger values of
+                :paramref:`interval`. This value can be temporarily overwritten, see
+                :meth:`run` for more information.
             progress:
                 Whether to show progress bar when checking convergence. This value can be
                 temporarily overwritten, see :meth:`run` for more information.
@@ -194,6 +212,8 @@ class CoexistingPhasesFinder:
                     self._constraints.append(cons.compiled(**kwargs))
         else:
             self._constraints.append(NoConstraintCompiled(self._num_feat))
+        # the compiled kernel takes a tuple, which is therefore created only once
+        self._constraints = tuple(self._constraints)
 
         self.check_instance(self._interaction)
         self.check_instance(self._entropy)
@@ -216,6 +236,7 @@ class CoexistingPhasesFinder:
         self._convergence_criterion = convergence_criterion
         self._tolerance = tolerance
         self._interval = interval
+        self._convergence_window = self._check_convergence_window(convergence_window)
         self._progress = progress
 
         self._random_std = random_std
@@ -229,12 +250,14 @@ class CoexistingPhasesFinder:
         # diagnostics
         self._diagnostics: dict[str, Any] = {}
 
-        ## initialize derived internal states
-        self._Js = np.full(self._num_part, 0.0, float)
-        self._omegas = np.full((self._num_feat, self._num_part), 0.0, float)
-        self._phis_feat = np.full((self._num_feat, self._num_part), 0.0, float)
-        self._phis_comp = np.full((self._num_comp, self._num_part), 0.0, float)
-        self._revive_count_left = self._max_revive_per_compartment * self._num_part
+        ## initialize derived internal states, Js and omegas are set by reinitialization
+        self._Js = np.empty(self._num_part)
+        self._omegas = np.empty((self._num_feat, self._num_part))
+        self._phis_feat = np.zeros((self._num_feat, self._num_part))
+        self._phis_comp = np.zeros((self._num_comp, self._num_part))
+        self._workspace = np.empty((4, self._num_part))
+        # the compiled kernel decreases the count in place, it is set by reinitialization
+        self._revive_count_left = np.empty(1, dtype=np.int64)
         self._kwargs_for_instances = kwargs
         self.reinitialize_random()
 
@@ -283,7 +306,7 @@ class CoexistingPhasesFinder:
             )
             raise FeatureNumberError
 
-    def check_field(self, field: np.ndarray) -> np.ndarray:
+    def check_field(self, field: np.ndarray, *, copy: bool = True) -> np.ndarray:
         r"""Check the size of a field.
 
         This method checks whether the :paramref:`field` has the same size as the
@@ -294,11 +317,19 @@ class CoexistingPhasesFinder:
         Args:
             field :
                 The field to check.
+            copy:
+                Whether the data is always copied. If `False`, :paramref:`field` is
+                returned directly if it is already a C-contiguous array of double
+                precision, which is sufficient when the field is only read.
 
         Returns:
-            : The field converted to numpy array.
+            : The field converted to a C-contiguous numpy array of double precision.
         """
-        field = np.array(field)
+        # a fixed memory layout and type avoids recompiling the kernels for new signatures
+        if copy:
+            field = np.array(field, dtype=np.float64, order="C")
+        else:
+            field = np.ascontiguousarray(field, dtype=np.float64)
         if field.shape != self._omegas.shape:
             self._logger.error(
                 "field with size of %s is invalid. It must have the size of %s.",
@@ -308,6 +339,24 @@ class CoexistingPhasesFinder:
             raise ValueError("New field must match the size of the old one.")
         return field
 
+    def _check_convergence_window(self, convergence_window: int) -> int:
+        """Check the number of successive convergence checks.
+
+        Args:
+            convergence_window:
+                The number of successive checks of convergence that must be passed.
+
+        Returns:
+            : The number of checks as an integer.
+        """
+        if convergence_window < 1:
+            self._logger.error(
+                "convergence window %s is invalid. It must be at least 1.",
+                convergence_window,
+            )
+            raise ValueError("Convergence window must be a positive integer.")
+        return int(convergence_window)
+
     def set_interaction(
         self, interaction: InteractionBase, *, if_reset_revive: bool = True, **kwargs
     ) -> None:
@@ -421,6 +470,7 @@ class CoexistingPhasesFinder:
                     )
         else:
             self._constraints.append(NoConstraintCompiled(self._num_feat))
+        self._constraints = tuple(self._constraints)
 
         for cons in self._constraints:
             self.check_instance(cons)
@@ -433,7 +483,7 @@ class CoexistingPhasesFinder:
     def reset_revive(self):
         """Reset the internal revive count."""
 
-        self._revive_count_left = self._max_revive_per_compartment * self._num_part
+        self._revive_count_left[0] = self._max_revive_per_compartment * self._num_part
 
     def reinitialize_constraint(self):
         """Reinitialize the constraints"""
@@ -451,7 +501,7 @@ class CoexistingPhasesFinder:
             self._random_std,
             (self._num_feat, self._num_part),
         )
-        self._Js = np.full(self._num_part, 1.0, float)
+        self._Js.fill(1.0)
         self.reset_revive()
         self.reinitialize_constraint()
 
@@ -464,7 +514,7 @@ class CoexistingPhasesFinder:
                 \times M`.
         """
         self._omegas = self.check_field(omegas)
-        self._Js = np.ones_like(self._Js)
+        self._Js.fill(1.0)
         self.reset_revive()
         self.reinitialize_constraint()
 
@@ -481,9 +531,10 @@ class CoexistingPhasesFinder:
                 New :math:`\phi_r^{(m)}`, must have the size of :math:`N_\mathrm{S} \times
                 M`.
         """
-        phis = self.check_field(phis)
+        # the potential is a new array, so phis do not need to be copied
+        phis = self.check_field(phis, copy=False)
         self._omegas = self._interaction.potential(phis)
-        self._Js = np.ones_like(self._Js)
+        self._Js.fill(1.0)
         self.reset_revive()
         self.reinitialize_constraint()
 
@@ -513,6 +564,7 @@ class CoexistingPhasesFinder:
         max_steps: float | None = None,
         tolerance: float | None = None,
         interval: int | None = None,
+        convergence_window: int | None = None,
         progress: bool | None = None,
     ) -> Phases:
         r"""Run instance to find coexisting phases.
@@ -533,8 +585,15 @@ class CoexistingPhasesFinder:
                 information.
             interval:
                 The interval of steps to check convergence.
+            convergence_window:
+                The number of successive checks of convergence that must be passed. See
+                :paramref:`~CoexistingPhasesFinder.convergence_window` for more
+                information.
             progress:
-                Whether to show progress bar when checking convergence.
+                Whether to show progress bar when checking convergence. Without progress,
+                the iteration runs in compiled code, which only returns to the interpreter
+                every 100 000 steps or after each interval, whichever is longer. A keyboard
+                interrupt therefore takes effect with this delay.
 
         Returns:
             :   Composition and relative size of the compartments. The member
@@ -550,107 +609,51 @@ class CoexistingPhasesFinder:
             tolerance = self._tolerance
         if interval is None:
             interval = self._interval
+        if convergence_window is None:
+            convergence_window = self._convergence_window
+        else:
+            convergence_window = self._check_convergence_window(convergence_window)
         if progress is None:
             progress = self._progress
 
-        steps_tracker = int(np.ceil(max_steps / interval))
-        steps_inner = max(1, int(np.ceil(max_steps)) // steps_tracker)
-
-        steps = 0
-
-        bar_max = -np.log10(tolerance)
-        bar_format = "{desc:<20}: {percentage:3.0f}%|{bar}{r_bar}"
-        bar_args = {
-            "total": bar_max,
-            "disable": not progress,
-            "bar_format": bar_format,
-        }
-        bar_text_args = {
-            "total": 1,
-            "disable": not progress,
-            "bar_format": "{desc}",
-        }
-        pbar1 = tqdm(**bar_args, position=0, desc="Incompressibility")
-        pbar2 = tqdm(**bar_args, position=1, desc="Field Error")
-        pbar3 = tqdm(**bar_args, position=2, desc="Volume Error")
-        pbar4 = tqdm(**bar_args, position=3, desc="Constraint Residue")
-        pbar5 = tqdm(**bar_text_args, position=4, desc="Revive Count Left")
+        if self._convergence_criterion != "standard":
+            raise ValueError(
+                f"Undefined convergence criterion: {self._convergence_criterion}"
+            )
 
-        bar_val_func = lambda a: max(0, min(round(-np.log10(max(a, 1e-100)), 1), bar_max))
+        steps_tracker = math.ceil(max_steps / interval)
+        steps_inner = max(1, math.ceil(max_steps) // steps_tracker)
 
         start_time = time.time()
 
-        for _ in range(steps_tracker):
-            # do the inner steps
+        if progress:
             (
+                steps,
+                converged,
                 max_abs_incomp,
                 max_abs_omega_diff,
                 max_abs_Js_diff,
                 max_constraint_residue,
-                revive_count,
-                is_last_step_safe,
-            ) = multicomponent_self_consistent_metastep(
-                self._interaction,
-                self._entropy,
-                self._ensemble,
-                tuple(self._constraints),
-                omegas=self._omegas,
-                Js=self._Js,
-                phis_feat=self._phis_feat,
-                phis_comp=self._phis_comp,
-                steps_inner=steps_inner,
-                acceptance_Js=self._acceptance_Js,
-                Js_step_upper_bound=self._Js_step_upper_bound,
-                acceptance_omega=self._acceptance_omega,
-                kill_threshold=self._kill_threshold,
-                revive_tries=self._revive_count_left,
-                revive_scaler=self._revive_scaler,
-                rng=self._rng,
+            ) = self._run_with_progress(
+                steps_tracker, steps_inner, tolerance, convergence_window
+            )
+        else:
+            (
+                steps,
+                converged,
+                max_abs_incomp,
+                max_abs_omega_diff,
+                max_abs_Js_diff,
+                max_constraint_residue,
+            ) = self._run_compiled(
+                steps_tracker, steps_inner, tolerance, convergence_window
             )
 
-            steps += steps_inner
-            self._revive_count_left -= revive_count
-            
-
-            if progress:
-                pbar1.n = bar_val_func(max_abs_incomp)
-                pbar2.n = bar_val_func(max_abs_omega_diff)
-                pbar3.n = bar_val_func(max_abs_Js_diff)
-                pbar4.n = bar_val_func(max_constraint_residue)
-                pbar5.n = 1
-                pbar1.refresh()
-                pbar2.refresh()
-                pbar3.refresh()
-                pbar4.refresh()
-                pbar5.set_description_str(
-                    "{:<20}: {}".format("Revive Count Left", self._revive_count_left)
-                )
-                pbar5.refresh()
-
-            # check convergence
-            if self._convergence_criterion == "standard":
-                if (
-                    is_last_step_safe
-                    and tolerance > max_abs_incomp
-                    and tolerance > max_abs_omega_diff
-                    and tolerance > max_abs_Js_diff
-                    and tolerance > max_constraint_residue
-                ):
-                    self._logger.info(
-                        "Composition and volumes reached stationary state after %d steps",
-                        steps,
-                    )
-                    break
-            else:
-                raise ValueError(
-                    f"Undefined convergence criterion: {self._convergence_criterion}"
-                )
-
-        pbar1.close()
-        pbar2.close()
-        pbar3.close()
-        pbar4.close()
-        pbar5.close()
+        if converged:
+            self._logger.info(
+                "Composition and volumes reached stationary state after %d steps",
+                steps,
+            )
 
         # get final result
         final_Js = self._Js.copy()
@@ -678,8 +681,204 @@ class CoexistingPhasesFinder:
             "max_abs_omega_diff": max_abs_omega_diff,
             "max_abs_js_diff": max_abs_Js_diff,
             "max_constraint_residue": max_constraint_residue,
-            "revive_count_left": self._revive_count_left,
+            "revive_count_left": int(self._revive_count_left[0]),
         }
 
         # transpose phi since `Phases` uses a different convention
         return Phases(final_Js, final_phis_comp.T)
+
+    def _run_compiled(
+        self,
+        steps_tracker: int,
+        steps_inner: int,
+        tolerance: float,
+        convergence_window: int,
+    ) -> tuple[int, bool, float, float, float, float]:
+        r"""Iterate until convergence in compiled code.
+
+        The iteration is done by the compiled kernel
+        :func:`~flory.mcmp._finder_impl.multicomponent_self_consistent_run`. It is called
+        repeatedly with at most :data:`_MAX_STEPS_PER_CALL` steps, or a single interval if
+        it is longer, such that the iteration can be interrupted.
+
+        Args:
+            steps_tracker:
+                Maximal number of checks of convergence.
+            steps_inner:
+                Number of steps between the checks of convergence.
+            tolerance:
+                The tolerance to determine convergence.
+            convergence_window:
+                The number of successive checks of convergence that must be passed.
+
+        Returns:
+            : The number of steps, whether the iteration converged, and the metrics of
+            convergence in the last step.
+        """
+        checks_per_call = max(1, _MAX_STEPS_PER_CALL // steps_inner)
+        steps = 0
+        converged_checks = 0
+        checks_left = steps_tracker
+        while checks_left > 0 and converged_checks < convergence_window:
+            num_checks = min(checks_per_call, checks_left)
+            checks_left -= num_checks
+            (
+                steps_call,
+                converged_checks,
+                max_abs_incomp,
+                max_abs_omega_diff,
+                max_abs_Js_diff,
+                max_constraint_residue,
+            ) = multicomponent_self_consistent_run(
+                self._interaction,
+                self._entropy,
+                self._ensemble,
+                self._constraints,
+                omegas=self._omegas,
+                Js=self._Js,
+                phis_feat=self._phis_feat,
+                phis_comp=self._phis_comp,
+                workspace=self._workspace,
+                steps_tracker=num_checks,
+                steps_inner=steps_inner,
+                tolerance=tolerance,
+                convergence_window=convergence_window,
+                converged_checks=converged_checks,
+                acceptance_Js=self._acceptance_Js,
+                Js_step_upper_bound=self._Js_step_upper_bound,
+                acceptance_omega=self._acceptance_omega,
+                kill_threshold=self._kill_threshold,
+                revive_count_left=self._revive_count_left,
+                revive_scaler=self._revive_scaler,
+                rng=self._rng,
+            )
+            steps += steps_call
+
+        return (
+            steps,
+            converged_checks >= convergence_window,
+            max_abs_incomp,
+            max_abs_omega_diff,
+            max_abs_Js_diff,
+            max_constraint_residue,
+        )
+
+    def _run_with_progress(
+        self,
+        steps_tracker: int,
+        steps_inner: int,
+        tolerance: float,
+        convergence_window: int,
+    ) -> tuple[int, bool, float, float, float, float]:
+        r"""Iterate until convergence while showing the progress.
+
+        This method mirrors the compiled kernel
+        :func:`~flory.mcmp._finder_impl.multicomponent_self_consistent_run`, but returns
+        to the interpreter after each check of convergence to update the progress bar.
+
+        Args:
+            steps_tracker:
+                Maximal number of checks of convergence.
+            steps_inner:
+                Number of steps between the checks of convergence.
+            tolerance:
+                The tolerance to determine convergence.
+            convergence_window:
+                The number of successive checks of convergence that must be passed.
+
+        Returns:
+            : The number of steps, whether the iteration converged, and the metrics of
+            convergence in the last step.
+        """
+        steps = 0
+        converged = False
+        # number of successive checks that have been passed
+        converged_checks = 0
+
+        # a single bar shows the progress of the least converged metric, while all
+        # metrics are shown as postfix. With `miniters=0`, the bar is redrawn at most once
+        # per `mininterval` seconds, independent of the number of updates.
+        bar_max = -math.log10(tolerance)
+        pbar = tqdm(
+            total=bar_max,
+            desc="Convergence",
+            bar_format="{l_bar}{bar}| [{elapsed}{postfix}]",
+            miniters=0,
+        )
+
+        bar_val_func = lambda a: max(
+            0, min(round(-math.log10(max(a, 1e-100)), 1), bar_max)
+        )
+
+        for _ in range(steps_tracker):
+            # do the inner steps
+            (
+                max_abs_incomp,
+                max_abs_omega_diff,
+                max_abs_Js_diff,
+                max_constraint_residue,
+                is_last_step_safe,
+            ) = multicomponent_self_consistent_metastep(
+                self._interaction,
+                self._entropy,
+                self._ensemble,
+                self._constraints,
+                omegas=self._omegas,
+                Js=self._Js,
+                phis_feat=self._phis_feat,
+                phis_comp=self._phis_comp,
+                workspace=self._workspace,
+                steps_inner=steps_inner,
+                acceptance_Js=self._acceptance_Js,
+                Js_step_upper_bound=self._Js_step_upper_bound,
+                acceptance_omega=self._acceptance_omega,
+                kill_threshold=self._kill_threshold,
+                revive_count_left=self._revive_count_left,
+                revive_scaler=self._revive_scaler,
+                rng=self._rng,
+            )
+
+            steps += steps_inner
+
+            pbar.set_postfix_str(
+                f"incompressibility={max_abs_incomp:.1e}, "
+                f"field error={max_abs_omega_diff:.1e}, "
+                f"volume error={max_abs_Js_diff:.1e}, "
+                f"constraint residue={max_constraint_residue:.1e}, "
+                f"revive count left={self._revive_count_left[0]:d}",
+                refresh=False,
+            )
+            bar_val = bar_val_func(
+                max(
+                    max_abs_incomp,
+                    max_abs_omega_diff,
+                    max_abs_Js_diff,
+                    max_constraint_residue,
+                )
+            )
+            pbar.update(bar_val - pbar.n)
+
+            # check convergence
+            converged_checks = update_converged_checks(
+                converged_checks,
+                tolerance,
+                max_abs_incomp,
+                max_abs_omega_diff,
+                max_abs_Js_diff,
+                max_constraint_residue,
+                is_last_step_safe,
+            )
+            if converged_checks >= convergence_window:
+                converged = True
+                break
+
+        pbar.close()
+
+        return (
+            steps,
+            converged,
+            max_abs_incomp,
+            max_abs_omega_diff,
+            max_abs_Js_diff,
+            max_constraint_residue,
+        )
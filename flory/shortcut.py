@@ -68,4 +68,73 @@ def find_coexisting_phases(
     # cluster (using default distance threshold), sort, and normalize the phases
     phases = phases.get_clusters().sort().normalize()
     # return result together with diagnostic information
-    return PhasesResult.from_phases(phases, info=finder.diagnostics.copy())
\ No newline at end of file
+    return PhasesResult.from_phases(phases, info=finder.diagnostics.copy())
+
+
+def find_coexisting_phases_batch(
+    num_comp: int,
+    chis: np.ndarray,
+    phi_means: np.ndarray,
+    sizes: np.ndarray | None = None,
+    **kwargs,
+) -> list[PhasesResult]:
+    r"""Find coexisting phases of many Flory-Huggins mixtures in canonical ensemble.
+
+    This function is equivalent to calling :func:`find_coexisting_phases` for each pair of
+    interaction matrix and average volume fractions, e.g. when sampling a phase diagram.
+    However, the class :class:`~flory.mcmp.finder.CoexistingPhasesFinder` is only created
+    once, and the interaction and the ensemble are replaced for each system, such that
+    the internal resources and the compiled core algorithm are reused. Each system is
+    randomly initialized before the iteration. Passing :code:`progress=False` avoids
+    showing a progress bar for each system and runs the iterations completely in compiled
+    code.
+
+    Args:
+        num_comp:
+            Number of components :math:`N_\mathrm{C}` in the systems.
+        chis:
+            The interaction matrices of all systems. 3D array with size of :math:`N_\mathrm{B}
+            \times N_\mathrm{C} \times N_\mathrm{C}`, where :math:`N_\mathrm{B}` is the
+            number of systems. See :func:`find_coexisting_phases` for more information.
+        phi_means:
+            The average volume fractions :math:`\bar{\phi}_i` of all systems. 2D array with
+            size of :math:`N_\mathrm{B} \times N_\mathrm{C}`. See
+            :func:`find_coexisting_phases` for more information.
+        sizes:
+            The relative molecule volumes :math:`l_i = \nu_i/\nu`, which are shared by all
+            systems. It is treated as all-one vector by default.
+        \**kwargs:
+            All additional arguments are used directly to initialize
+            :class:`~flory.mcmp.finder.CoexistingPhasesFinder`.
+
+    Returns:
+        :
+            List with the composition and relative size of the phases of each system. See
+            :func:`find_coexisting_phases` for more information.
+    """
+    if len(chis) != len(phi_means):
+        raise ValueError("The numbers of interaction matrices and compositions differ.")
+
+    results = []
+    finder = None
+    for chis_single, phi_means_single in zip(chis, phi_means):
+        if finder is None:
+            free_energy = FloryHuggins(num_comp, chis_single, sizes)
+            ensemble = CanonicalEnsemble(num_comp, phi_means_single)
+            finder = CoexistingPhasesFinder(
+                free_energy.interaction,
+                free_energy.entropy,
+                ensemble,
+                **kwargs,
+            )
+        else:
+            free_energy.chis = chis_single
+            ensemble.phi_means = phi_means_single
+            finder.set_interaction(free_energy.interaction)
+            finder.set_ensemble(ensemble)
+            finder.reinitialize_random()
+        phases = finder.run()
+        # cluster (using default distance threshold), sort, and normalize the phases
+        phases = phases.get_clusters().sort().normalize()
+        results.append(PhasesResult.from_phases(phases, info=finder.diagnostics.copy()))
+    return results
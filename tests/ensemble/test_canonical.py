@@ -22,4 +22,8 @@ def test_canonical_ensemble():
     e.phi_means = [1, 0]
     np.testing.assert_allclose(e.phi_means, [1, 0])
     with pytest.raises(ValueError):
-        e.phi_means = [0.25, 0.25, 0.25, 0.25]
\ No newline at end of file
+        e.phi_means = [0.25, 0.25, 0.25, 0.25]
+    # parameters are stored as C-contiguous doubles for the compiled instance
+    e = CanonicalEnsemble(2, 0.5)
+    assert e.phi_means.dtype == np.float64
+    assert e.phi_means.flags.c_contiguous
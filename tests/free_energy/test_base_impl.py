@@ -0,0 +1,69 @@
+"""
+.. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
+"""
+
+import numpy as np
+import pytest
+
+from flory.free_energy._base_impl import *
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 6])
+def test_count_negative_eigenvalues(size: int):
+    """Test function count_negative_eigenvalues()"""
+    rng = np.random.default_rng(5)
+    num_batch = 50
+    # symmetric matrices with prescribed eigenvalues of random signs
+    eigenvalues = rng.uniform(0.1, 2.0, (num_batch, size))
+    eigenvalues *= rng.choice([-1.0, 1.0], (num_batch, size))
+    basis = np.linalg.qr(rng.normal(size=(num_batch, size, size)))[0]
+    mats = basis @ (eigenvalues[..., None] * np.swapaxes(basis, -1, -2))
+    mats = 0.5 * (mats + np.swapaxes(mats, -1, -2))
+
+    expected = np.sum(eigenvalues < 0, axis=-1)
+    np.testing.assert_equal(count_negative_eigenvalues(mats), expected)
+    np.testing.assert_equal(
+        count_negative_eigenvalues(mats.astype(np.float32)), expected
+    )
+    np.testing.assert_equal(check_stability(mats), expected == 0)
+
+
+def test_is_positive_definite():
+    """Test function is_positive_definite() and check_stability()"""
+    assert is_positive_definite(np.eye(3))
+    assert not is_positive_definite(np.diag([1.0, 0.0, 2.0]))
+    assert not is_positive_definite(np.array([[1.0, 2.0], [2.0, 1.0]]))
+    assert has_negative_diagonal(np.diag([1.0, -1.0]))
+    assert not has_negative_diagonal(np.array([[1.0, 2.0], [2.0, 1.0]]))
+    # positive semi-definite matrices are stable, but not positive definite
+    mats = np.array([np.diag([1.0, 0.0]), np.diag([1.0, -1.0]), np.ones((2, 2))])
+    np.testing.assert_equal(check_stability(mats), [True, False, True])
+
+
+def test_count_negative_pivots_degenerate():
+    """Test function count_negative_pivots() for matrices requiring pivoting"""
+    assert count_negative_pivots(np.zeros((3, 3))) == 0
+    assert count_negative_pivots(np.array([[0.0, 1.0], [1.0, 0.0]])) == 1
+    assert (
+        count_negative_pivots(
+            np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0, 0, -1.0]])
+        )
+        == 2
+    )
+    assert count_negative_pivots(np.diag([-1.0, 0.0, 2.0])) == 1
+
+
+@pytest.mark.parametrize("index", [0, 1, 3])
+def test_reduce_hessian(index: int):
+    """Test function reduce_hessian()"""
+    rng = np.random.default_rng(8)
+    size = 4
+    hessians = rng.normal(size=(5, size, size))
+    hessians += np.swapaxes(hessians, -1, -2)
+    trans = np.delete(np.eye(size), index, axis=0)
+    trans[:, index] = -1
+
+    out = np.empty((5, size - 1, size - 1))
+    reduce_hessian(hessians, index, out)
+    np.testing.assert_allclose(out, trans @ hessians @ trans.T)
+    np.testing.assert_array_equal(out, np.swapaxes(out, -1, -2))
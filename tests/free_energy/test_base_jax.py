@@ -0,0 +1,66 @@
+"""
+.. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import flory
+
+jax = pytest.importorskip("jax")
+
+
+@pytest.fixture(autouse=True)
+def _enable_x64():
+    """Use double precision in jax for comparison with numpy"""
+    enable_x64 = jax.config.read("jax_enable_x64")
+    jax.config.update("jax_enable_x64", True)
+    yield
+    jax.config.update("jax_enable_x64", enable_x64)
+
+
+@pytest.mark.parametrize("shape", [(), (5,), (2, 3)])
+def test_free_energy_jax(shape):
+    """Test that FreeEnergyJAX agrees with the hand-written derivatives"""
+    from flory.free_energy import FreeEnergyJAX
+
+    rng = np.random.default_rng(7)
+    num_comp = 3
+    sizes = [1.0, 2.0, 1.5]
+    f = flory.FloryHuggins.from_random_normal(num_comp, 2.0, 2.0, sizes=sizes, rng=rng)
+    f_jax = FreeEnergyJAX.from_flory_huggins(num_comp, f.chis, sizes)
+    phis = rng.uniform(0.1, 1.0, shape + (num_comp,))
+    phis /= phis.sum(axis=-1, keepdims=True)
+
+    np.testing.assert_allclose(
+        f_jax.free_energy_density(phis), f.free_energy_density(phis)
+    )
+    np.testing.assert_allclose(f_jax.jacobian(phis, 1), f.jacobian(phis, 1))
+    np.testing.assert_allclose(f_jax.hessian(phis, 1), f.hessian(phis, 1))
+    np.testing.assert_allclose(
+        f_jax.chemical_potentials(phis), f.chemical_potentials(phis)
+    )
+    np.testing.assert_equal(f_jax.num_unstable_modes(phis), f.num_unstable_modes(phis))
+    with pytest.raises(NotImplementedError):
+        f_jax.interaction_compiled()
+
+
+def test_free_energy_jax_missing(monkeypatch):
+    """Test that a missing jax is reported before it is used"""
+    from flory.free_energy import FreeEnergyJAX
+
+    monkeypatch.setitem(sys.modules, "jax", None)
+    monkeypatch.setitem(sys.modules, "jax.numpy", None)
+    with pytest.raises(ImportError):
+        FreeEnergyJAX.from_flory_huggins(2, 3.0)
+    with pytest.raises(ImportError):
+        FreeEnergyJAX(2, np.sum, np.sum)
+
+
+def test_import_without_jax():
+    """Test that importing flory does not import jax"""
+    code = "import sys, flory; assert 'jax' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,317 @@
+"""
+.. codeauthor:: Yicheng Qiang <yicheng.qiang@ds.mpg.de>
+"""
+
+import logging
+
+import numpy as np
+import pytest
+
+import flory
+
+
+def _random_phis(rng, num_comp, shape=()):
+    phis = rng.uniform(0.1, 1.0, shape + (num_comp,))
+    return phis / phis.sum(axis=-1, keepdims=True)
+
+
+@pytest.mark.parametrize("shape", [(), (5,), (2, 3)])
+def test_free_energy_impl_sum(shape):
+    """Test that the free energy combines interaction and entropy"""
+    rng = np.random.default_rng(1)
+    num_comp = 4
+    f = flory.FloryHuggins.from_random_normal(
+        num_comp, 2.0, 1.0, sizes=[1.0, 2.0, 1.5, 1.0], rng=rng
+    )
+    phis = _random_phis(rng, num_comp, shape)
+
+    for kind in ["energy", "jacobian", "hessian"]:
+        expected = getattr(f.interaction, f"_{kind}_impl")(phis) + getattr(
+            f.entropy, f"_{kind}_impl"
+        )(phis)
+        np.testing.assert_allclose(getattr(f, f"_{kind}_impl")(phis), expected)
+
+
+class _QuadraticInteraction(flory.InteractionBase):
+    """Quadratic interaction, which returns arrays it does not own"""
+
+    def _energy_impl(self, phis):
+        return 0.5 * np.einsum("...i,...i->...", phis, phis)
+
+    def _jacobian_impl(self, phis):
+        return phis
+
+    def _hessian_impl(self, phis):
+        return np.broadcast_to(
+            np.identity(self.num_comp), phis.shape + (self.num_comp,)
+        )
+
+
+def test_free_energy_impl_aliasing():
+    """Results of the interaction are not modified in place"""
+    entropy = flory.IdealGasEntropy(2, [1.0, 2.0])
+    f = flory.FreeEnergyBase(_QuadraticInteraction(2), entropy)
+    phis = np.array([0.3, 0.7])
+    jac = f.jacobian(phis)
+    np.testing.assert_equal(phis, [0.3, 0.7])
+    np.testing.assert_allclose(jac, phis + entropy._jacobian_impl(phis))
+
+
+class _QuadraticInteractionOut(_QuadraticInteraction):
+    """Quadratic interaction, which accepts but ignores the output array"""
+
+    def _hessian_impl(self, phis, out=None):
+        return np.array(super()._hessian_impl(phis))
+
+
+@pytest.mark.parametrize(
+    "interaction_cls", [_QuadraticInteraction, _QuadraticInteractionOut]
+)
+def test_hessian_impl_interface(interaction_cls):
+    """Hessians are combined from implementations with and without `out`"""
+    entropy = flory.IdealGasEntropy(2, [1.0, 2.0])
+    f = flory.FreeEnergyBase(interaction_cls(2), entropy)
+    phis = np.array([[0.3, 0.7], [0.6, 0.4]])
+    expected = np.identity(2) + entropy._hessian_impl(phis)
+    np.testing.assert_allclose(f.hessian(phis), expected)
+    reduced = expected[:, 0, 0] + expected[:, 1, 1] - 2 * expected[:, 0, 1]
+    np.testing.assert_allclose(f.hessian(phis, 0)[:, 0, 0], reduced)
+    assert np.all(f.is_stable(phis))
+
+
+class _FloryHugginsLegacy(flory.FloryHuggins):
+    """Flory-Huggins free energy overriding the Hessian without `out`"""
+
+    def _hessian_impl(self, phis):
+        return np.array(super()._hessian_impl(phis))
+
+
+def test_hessian_impl_legacy_free_energy():
+    """Hessians are obtained from free energies overriding `_hessian_impl(phis)`"""
+    f = flory.FloryHuggins(2, 3.0)
+    f_legacy = _FloryHugginsLegacy(2, 3.0)
+    phis = np.array([[0.3, 0.7], [0.6, 0.4]])
+    expected = f.hessian(phis)
+    np.testing.assert_allclose(f_legacy.hessian(phis), expected)
+    out = np.empty((2, 2, 2))
+    assert f_legacy.hessian(phis, out=out) is out
+    np.testing.assert_allclose(out, expected)
+    np.testing.assert_allclose(f_legacy.hessian(phis, 0), f.hessian(phis, 0))
+    np.testing.assert_equal(f_legacy.is_stable(phis), f.is_stable(phis))
+
+
+def test_free_energy_derivatives():
+    """Test the Jacobian and Hessian against finite differences"""
+    rng = np.random.default_rng(2)
+    num_comp = 3
+    f = flory.FloryHuggins.from_random_normal(num_comp, 1.0, 2.0, rng=rng)
+    phis = _random_phis(rng, num_comp)
+    eps = 1e-6
+
+    jac = f.jacobian(phis)
+    hess = f.hessian(phis)
+    for itr in range(num_comp):
+        dphis = np.zeros(num_comp)
+        dphis[itr] = eps
+        np.testing.assert_allclose(
+            (f.free_energy_density(phis + dphis) - f.free_energy_density(phis - dphis))
+            / (2 * eps),
+            jac[itr],
+            rtol=1e-5,
+        )
+        np.testing.assert_allclose(
+            (f.jacobian(phis + dphis) - f.jacobian(phis - dphis)) / (2 * eps),
+            hess[itr],
+            rtol=1e-5,
+            atol=1e-8,
+        )
+
+
+def test_check_volume_fractions():
+    """Test the validation of volume fractions"""
+    f = flory.FloryHuggins(3, 1.0)
+    np.testing.assert_allclose(
+        f.check_volume_fractions([0.2, 0.3, 0.5]), [0.2, 0.3, 0.5]
+    )
+    assert f.check_volume_fractions(np.empty((0, 3))).shape == (0, 3)
+    with pytest.raises(flory.common.VolumeFractionError):
+        f.check_volume_fractions([0.5, 0.5])
+    with pytest.raises(flory.common.VolumeFractionError):
+        f.check_volume_fractions([[0.2, 0.3, 0.5], [0.6, -0.1, 0.5]])
+
+    # the validated volume fractions are plain contiguous arrays
+    phis = np.asfortranarray([[0.2, 0.3, 0.5], [0.1, 0.1, 0.8]])
+    assert f.check_volume_fractions(phis).flags.c_contiguous
+    phis = np.array([[0.2, 0.3, 0.5], [0.1, 0.1, 0.8]])
+    assert f.check_volume_fractions(phis) is phis
+    assert type(f.check_volume_fractions(np.ma.masked_array(phis))) is np.ndarray
+
+
+def test_parameters_dtype():
+    """Test that parameters are stored as doubles without keeping references"""
+    chis = np.array([[0, 3], [3, 0]])
+    f = flory.FloryHuggins(2, chis, sizes=[1, 2])
+    assert f.chis.dtype == np.float64
+    assert f.sizes.dtype == np.float64
+    assert not np.shares_memory(f.chis, chis)
+
+    compiled = f.interaction.compiled()
+    f.interaction.set_uniform_chis(2)
+    assert f.chis.dtype == np.float64
+    f.interaction.set_random_chis()
+    np.testing.assert_equal(compiled._chis, chis)
+
+    compiled = f.interaction.compiled()
+    f.interaction.chis[0, 1] = 10.0
+    np.testing.assert_equal(compiled._chis, compiled._chis.T)
+    assert compiled._chis[0, 1] != 10.0
+
+    compiled = f.entropy.compiled()
+    f.entropy.sizes[1] = 4.0
+    np.testing.assert_equal(compiled._sizes, [1, 2])
+    np.testing.assert_equal(compiled._inv_sizes, [1, 0.5])
+
+
+@pytest.mark.parametrize("shape", [(), (4,), (2, 3)])
+def test_chemical_potentials(shape):
+    """Test the chemical potentials against the definition"""
+    rng = np.random.default_rng(3)
+    num_comp = 3
+    f = flory.FloryHuggins.from_random_normal(num_comp, sizes=[1.0, 2.0, 3.0], rng=rng)
+    phis = _random_phis(rng, num_comp, shape)
+
+    fs = f.free_energy_density(phis)
+    js = f.jacobian(phis)
+    expected = (fs - np.sum(phis * js, axis=-1))[..., None] + js
+    mus = f.chemical_potentials(phis)
+    # a single phase keeps a leading axis of length one
+    assert mus.shape == (shape or (1,)) + (num_comp,)
+    expected = expected.reshape(mus.shape)
+    np.testing.assert_allclose(mus, expected)
+    np.testing.assert_allclose(
+        f.exchange_chemical_potentials(phis, 0), mus - mus[..., 0, None]
+    )
+    np.testing.assert_allclose(f.pressure(phis, 0), -mus[..., 0])
+    np.testing.assert_allclose(f.chemical_potentials(phis.tolist()), mus)
+
+    fs, js = f.free_energy_and_jacobian(phis)
+    np.testing.assert_allclose(fs, f.free_energy_density(phis))
+    np.testing.assert_allclose(js, f.jacobian(phis))
+    np.testing.assert_allclose(f.chemical_potentials_from(phis, fs, js), mus)
+
+
+@pytest.mark.parametrize("num_comp", [4, 10])
+@pytest.mark.parametrize("index", [0, 2, -1])
+def test_conserved_derivatives(num_comp, index):
+    """Test the Jacobian and Hessian with volume conservation"""
+    rng = np.random.default_rng(4)
+    sizes = rng.uniform(1.0, 3.0, num_comp)
+    f = flory.FloryHuggins.from_random_normal(num_comp, sizes=sizes, rng=rng)
+    phis = _random_phis(rng, num_comp, (3,))
+
+    # transformation from the independent to all volume fractions
+    trans = np.delete(np.eye(num_comp), index, axis=0)
+    trans[:, index] = -1
+
+    j_full = f.jacobian(phis)
+    h_full = f.hessian(phis)
+    np.testing.assert_allclose(f.jacobian(phis, index), j_full @ trans.T)
+    np.testing.assert_allclose(f.hessian(phis, index), trans @ h_full @ trans.T)
+    np.testing.assert_allclose(
+        f.exchange_chemical_potentials(phis, index),
+        np.insert(f.jacobian(phis, index), index % num_comp, 0, axis=-1),
+    )
+
+
+@pytest.mark.parametrize("index", [None, 1])
+def test_hessian_out(index):
+    """Test writing the Hessian to a given array"""
+    rng = np.random.default_rng(5)
+    num_comp = 4
+    f = flory.FloryHuggins.from_random_normal(num_comp, rng=rng)
+    phis = _random_phis(rng, num_comp, (3, 2))
+    expected = f.hessian(phis, index)
+
+    out = np.empty_like(expected)
+    assert f.hessian(phis, index, out=out) is out
+    np.testing.assert_allclose(out, expected)
+
+    # results of repeated calls must not share memory
+    other = f.hessian(_random_phis(rng, num_comp, (3, 2)), index)
+    assert not np.shares_memory(other, expected)
+    np.testing.assert_allclose(f.hessian(phis, index), expected)
+
+    with pytest.raises(ValueError):
+        f.hessian(phis, index, out=np.empty((3, 2, 5, 5)))
+
+
+@pytest.mark.parametrize("conserved", [True, False])
+def test_stability(conserved):
+    """Test the number of unstable modes against a diagonalization"""
+    rng = np.random.default_rng(6)
+    num_comp = 4
+    f = flory.FloryHuggins.from_random_normal(num_comp, 3.0, 3.0, rng=rng)
+    phis = _random_phis(rng, num_comp, (20, 2))
+
+    eigenvalues = np.linalg.eigvalsh(f.hessian(phis, 0 if conserved else None))
+    expected = np.sum(eigenvalues < 0, axis=-1)
+    assert np.any(expected > 0)
+    np.testing.assert_equal(f.num_unstable_modes(phis, conserved), expected)
+    np.testing.assert_equal(f.is_stable(phis, conserved), expected == 0)
+    assert f.num_unstable_modes(phis[0, 0], conserved) == expected[0, 0]
+
+    # repeated analyses do not affect returned Hessians or keep arrays on the instance
+    attributes = set(vars(f))
+    hessians = f.hessian(phis, 0 if conserved else None)
+    f.is_stable(phis[::-1], conserved)
+    np.testing.assert_equal(f.num_unstable_modes(phis, conserved), expected)
+    np.testing.assert_allclose(np.linalg.eigvalsh(hessians), eigenvalues)
+    assert set(vars(f)) == attributes
+
+    # single precision only affects compositions close to the spinodal
+    margin = np.abs(eigenvalues).min(axis=-1) > 1e-3
+    np.testing.assert_equal(
+        f.num_unstable_modes(phis, conserved, dtype=np.float32)[margin],
+        expected[margin],
+    )
+
+    # caller-owned workspaces are reused for the Hessians
+    num_indep = num_comp - 1 if conserved else num_comp
+    for dtype in [np.float64, np.float32]:
+        workspace = np.empty((20, 2, num_indep, num_indep), dtype=dtype)
+        counts = f.num_unstable_modes(phis, conserved, dtype=dtype, workspace=workspace)
+        np.testing.assert_equal(counts[margin], expected[margin])
+        np.testing.assert_allclose(
+            workspace, hessians, rtol=1e-5 if dtype == np.float32 else 1e-7
+        )
+        stable = f.is_stable(phis, conserved, dtype=dtype, workspace=workspace)
+        np.testing.assert_equal(stable[margin], expected[margin] == 0)
+    with pytest.raises(ValueError):
+        f.is_stable(phis, conserved, workspace=np.empty((20, 2, 4, 4), np.float32))
+    with pytest.raises(ValueError):
+        f.is_stable(phis[0], conserved, workspace=workspace)
+
+
+@pytest.mark.parametrize("conserved", [True, False])
+def test_stability_validation(conserved, monkeypatch):
+    """The volume fractions are only validated once in the stability analysis"""
+    f = flory.FloryHuggins(3, 2.0)
+    calls = []
+    check = f.check_volume_fractions
+    monkeypatch.setattr(
+        f, "check_volume_fractions", lambda phis: calls.append(1) or check(phis)
+    )
+    f.is_stable(np.full((4, 3), 1 / 3), conserved)
+    f.num_unstable_modes(np.full((4, 3), 1 / 3), conserved)
+    assert len(calls) == 2
+
+
+def test_chis_symmetry_warning(caplog):
+    """Only asymmetric interaction matrices are reported"""
+    free_energy = flory.FloryHuggins(2, [[0, 1.0], [1.0, 0]])
+    with caplog.at_level(logging.WARNING):
+        free_energy.chis = [[0, 1.0], [1.0, 0]]
+        assert "symmetrized" not in caplog.text
+        free_energy.chis = [[0, 1.0], [3.0, 0]]
+        assert "symmetrized" in caplog.text
+    np.testing.assert_allclose(free_energy.chis, [[0, 2.0], [2.0, 0]])
@@ -64,3 +64,97 @@ def test_CoexistingPhasesFinder_set_instances():
     
     finder.run(max_steps=100)
 
+
+def test_CoexistingPhasesFinder_reinitialize():
+    num_comp = 3
+    chis = [[0, 4.0, 2.0], [4.0, 0, 1.0], [2.0, 1.0, 0]]
+    free_energy = flory.FloryHuggins(num_comp, chis)
+    ensemble = flory.CanonicalEnsemble(num_comp, [0.3, 0.3, 0.4])
+    finder = flory.CoexistingPhasesFinder(
+        free_energy.interaction, free_energy.entropy, ensemble, num_part=8
+    )
+
+    # fields of other layouts and types are converted to C-contiguous doubles
+    omegas = np.arange(24, dtype=np.int32).reshape(8, 3).T
+    finder.reinitialize_from_omegas(omegas)
+    assert finder.omegas.flags.c_contiguous
+    assert finder.omegas.dtype == np.float64
+    np.testing.assert_equal(finder.omegas, omegas)
+    assert not np.shares_memory(finder.omegas, omegas)
+
+    with pytest.raises(ValueError):
+        finder.reinitialize_from_omegas(omegas.T)
+
+    # volume fractions are only read, so they are not copied
+    phis = np.full((3, 8), 1 / 3)
+    assert finder.check_field(phis, copy=False) is phis
+    finder.reinitialize_from_phis(phis)
+    assert not np.shares_memory(finder.omegas, phis)
+    np.testing.assert_allclose(finder.omegas, np.array(chis) @ phis)
+
+
+def test_CoexistingPhasesFinder_convergence_window(monkeypatch):
+    num_comp = 2
+    free_energy = flory.FloryHuggins(num_comp, [[0, 4.0], [4.0, 0]])
+    ensemble = flory.CanonicalEnsemble(num_comp, [0.5, 0.5])
+    finder = flory.CoexistingPhasesFinder(
+        free_energy.interaction,
+        free_energy.entropy,
+        ensemble,
+        rng=np.random.default_rng(0),
+        progress=False,
+    )
+
+    finder.run(interval=1000)
+    assert finder.diagnostics["steps"] < 1_000_000
+
+    # the converged state passes the subsequent checks immediately
+    finder.run(interval=1000, convergence_window=3)
+    assert finder.diagnostics["steps"] == 3000
+
+    # the passed checks are counted across calls of the compiled iteration
+    monkeypatch.setattr(flory.mcmp.finder, "_MAX_STEPS_PER_CALL", 1000)
+    finder.run(interval=1000, convergence_window=3)
+    assert finder.diagnostics["steps"] == 3000
+
+    with pytest.raises(ValueError):
+        finder.run(convergence_window=0)
+    with pytest.raises(ValueError):
+        flory.CoexistingPhasesFinder(
+            free_energy.interaction, free_energy.entropy, ensemble, convergence_window=0
+        )
+
+
+def test_CoexistingPhasesFinder_progress(monkeypatch):
+    """The compiled iteration without progress matches the one with progress"""
+    num_comp = 3
+    free_energy = flory.FloryHuggins(
+        num_comp, [[0, 4.0, 2.0], [4.0, 0, 1.0], [2.0, 1.0, 0]]
+    )
+    ensemble = flory.CanonicalEnsemble(num_comp, [0.3, 0.3, 0.4])
+
+    results = []
+    for progress, max_steps_per_call in [(True, None), (False, None), (False, 2500)]:
+        if max_steps_per_call is not None:
+            # split the compiled iteration into several calls
+            monkeypatch.setattr(
+                flory.mcmp.finder, "_MAX_STEPS_PER_CALL", max_steps_per_call
+            )
+        finder = flory.CoexistingPhasesFinder(
+            free_energy.interaction,
+            free_energy.entropy,
+            ensemble,
+            rng=np.random.default_rng(0),
+            progress=progress,
+        )
+        phases = finder.run(max_steps=10_000, interval=1000)
+        results.append((phases, finder.omegas.copy(), finder.diagnostics))
+
+    keys = ["steps", "max_abs_incomp", "max_abs_omega_diff", "revive_count_left"]
+    phases_1, omegas_1, diag_1 = results[0]
+    for phases_2, omegas_2, diag_2 in results[1:]:
+        np.testing.assert_equal(omegas_1, omegas_2)
+        np.testing.assert_equal(phases_1.volumes, phases_2.volumes)
+        np.testing.assert_equal(phases_1.fractions, phases_2.fractions)
+        for key in keys:
+            assert diag_1[key] == diag_2[key]
@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 from numba.experimental import jitclass
 
+import flory
 from flory.mcmp._finder_impl import *
 
 
@@ -118,3 +119,47 @@ def test_revive_compartments_by_copy_not_nice():
     np.testing.assert_allclose(
         np.dot(targets, Js), np.dot(targets_original, Js_original * mask)
     )
+
+
+def test_revive_compartments_by_copy_no_dead():
+    """Test function revive_compartments_by_copy() without dead compartments"""
+    rng = np.random.default_rng(1)
+    Js = np.array([1.0, 0.3, 0.2, 1.8])
+    targets = rng.uniform(-3.0, 3.0, (3, 4))
+    Js_original = Js.copy()
+    targets_original = targets.copy()
+    assert revive_compartments_by_copy(Js, targets, 0.1, rng) == 0
+    np.testing.assert_equal(Js, Js_original)
+    np.testing.assert_equal(targets, targets_original)
+
+
+@pytest.mark.parametrize("revive_count", [0, 5])
+def test_multicomponent_self_consistent_metastep_revive(revive_count: int):
+    """Test the revive count of function multicomponent_self_consistent_metastep()"""
+    free_energy = flory.FloryHuggins(3, 4.0)
+    ensemble = flory.CanonicalEnsemble(3, [0.3, 0.3, 0.4])
+    rng = np.random.default_rng(1)
+    Js = np.array([1.0, 1.0, 0.0, 0.0])
+    revive_count_left = np.array([revive_count])
+    multicomponent_self_consistent_metastep(
+        free_energy.interaction.compiled(),
+        free_energy.entropy.compiled(),
+        ensemble.compiled(),
+        (flory.NoConstraint(3).compiled(),),
+        omegas=rng.normal(0.0, 1.0, (3, 4)),
+        Js=Js,
+        phis_comp=np.empty((3, 4)),
+        phis_feat=np.empty((3, 4)),
+        workspace=np.empty((4, 4)),
+        steps_inner=1,
+        acceptance_Js=0.0002,
+        Js_step_upper_bound=0.001,
+        acceptance_omega=0.002,
+        kill_threshold=0.0,
+        revive_count_left=revive_count_left,
+        revive_scaler=1.0,
+        rng=rng,
+    )
+    # both dead compartments are revived in the first step if allowed
+    assert revive_count_left[0] == max(revive_count - 2, 0)
+    assert np.all(Js > 0) == (revive_count > 0)
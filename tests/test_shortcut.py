@@ -64,3 +64,36 @@ def test_find_coexisting_phases_asymmetric_ternary(num_part: int):
     )
     np.testing.assert_allclose(phases.volumes, volumes_ref, rtol=1e-5)
     np.testing.assert_allclose(phases.fractions, phis_ref, rtol=1e-5)
+
+
+def test_find_coexisting_phases_batch():
+    """Test function `find_coexisting_phases_batch` with a ternary system"""
+    num_comp = 3
+    chis = np.array([[3.27, -0.34, 0], [-0.34, -3.96, 0], [0, 0, 0]])
+    phi_means = np.array([0.16, 0.55, 0.29])
+    sizes = np.array([2.0, 2.0, 1.0])
+
+    volumes_ref = np.array([0.63348903, 0.36651097])
+    phis_ref = np.array(
+        [[0.07578904, 0.81377563, 0.11043533], [0.30555285, 0.09408195, 0.60036519]]
+    )
+
+    # the second system does not phase separate
+    results = flory.find_coexisting_phases_batch(
+        num_comp,
+        [chis, np.zeros((num_comp, num_comp)), chis],
+        [phi_means, phi_means, phi_means],
+        sizes=sizes,
+        num_part=16,
+        tolerance=1e-7,
+        progress=False,
+    )
+    assert len(results) == 3
+    for phases in [results[0], results[2]]:
+        np.testing.assert_allclose(phases.volumes, volumes_ref, rtol=1e-5)
+        np.testing.assert_allclose(phases.fractions, phis_ref, rtol=1e-5)
+    np.testing.assert_allclose(results[1].volumes, [1.0])
+    np.testing.assert_allclose(results[1].fractions, [phi_means], rtol=1e-5)
+
+    with pytest.raises(ValueError):
+        flory.find_coexisting_phases_batch(num_comp, [chis], [phi_means] * 2)